@@ -28,7 +28,7 @@ from app.services.crew_service import BiddingDocumentCrew
 from app.services.nara_bid_service import get_latest_bid_notice
 from app.services.template_validation_service import validate_template_workflow
 from app.utils.document_parser import parse_document
-from app.utils.document_converter import convert_document, convert_html_document
+from app.utils.document_converter import convert_document_async, convert_html_document_async
 from app.config import get_settings
 
 from sqlalchemy.orm import Session
@@ -164,7 +164,7 @@ async def upload_document(
         else:
             # PDF 또는 DOCX로 변환
             try:
-                file_bytes = convert_document(final_document, format.lower())
+                file_bytes = await convert_document_async(final_document, format.lower())
                 extension = "pdf" if format.lower() == "pdf" else "docx"
                 filename = f"공고문_{session_id[:8]}.{extension}"
                 
@@ -264,7 +264,7 @@ async def generate_from_extracted(
         else:
             # PDF 또는 DOCX로 변환
             try:
-                file_bytes = convert_document(final_document, format.lower())
+                file_bytes = await convert_document_async(final_document, format.lower())
                 extension = "pdf" if format.lower() == "pdf" else "docx"
                 filename = f"공고문_{session_id[:8]}.{extension}"
                 
@@ -409,7 +409,7 @@ async def export_document(
 
     try:
         # 문서 변환
-        file_bytes = convert_document(state.generated_document, format.lower())
+        file_bytes = await convert_document_async(state.generated_document, format.lower())
         
         # 파일 확장자 결정
         extension = format.lower()
@@ -948,7 +948,7 @@ async def convert_html(
             raise HTTPException(status_code=400, detail="HTML 내용이 비어있습니다.")
         
         # HTML을 지정된 형식으로 변환
-        file_bytes = convert_html_document(html_content, format.lower())
+        file_bytes = await convert_html_document_async(html_content, format.lower())
         
         # 파일 확장자 및 MIME 타입 설정
         format_map = {
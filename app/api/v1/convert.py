@@ -484,10 +484,10 @@ async def convert_document(request: Request):
         
         try:
             # convert_html_document 함수 사용 (PDF는 DOCX 경로 사용, 인코딩 문제 해결)
-            from app.utils.document_converter import convert_html_document
+            from app.utils.document_converter import convert_html_document_async
             
             logger.info(f"convert_html_document 호출: format={convert_request.format}")
-            file_bytes = convert_html_document(convert_request.html, convert_request.format)
+            file_bytes = await convert_html_document_async(convert_request.html, convert_request.format)
             logger.info(f"✅ {format_name.upper()} 변환 완료: {len(file_bytes)} bytes")
         except Exception as e2:
             import traceback
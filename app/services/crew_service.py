@@ -288,7 +288,7 @@ class BiddingDocumentCrew:
                             if industry_code:
                                 validated_codes.append(industry_code)
                 
-                filtered_data["industry_codes"] = list(set(validated_codes))  # 중복 제거
+                filtered_data["industry_codes"] = list(dict.fromkeys(validated_codes))  # 중복 제거 (순서 유지)
         
         return filtered_data
 
@@ -476,7 +476,7 @@ class BiddingDocumentCrew:
                     print(f"📊 업종코드 조회 완료: 성공 {success_count}/{len(industry_names_to_lookup)}개")
                 
                 if validated_codes:
-                    filtered_data["industry_codes"] = list(set(validated_codes))  # 중복 제거
+                    filtered_data["industry_codes"] = list(dict.fromkeys(validated_codes))  # 중복 제거 (순서 유지)
                     print(f"✅ 업종코드 최종 결과: {filtered_data['industry_codes']}")
                 else:
                     # 숫자 코드가 없으면 null로 설정
@@ -4,9 +4,60 @@ Field Mapper Tool
 구매계획서에서 추출한 데이터를 템플릿 필드에 매핑하는 도구
 """
 
-from typing import Dict, Any
+import io
+import re
+from types import MappingProxyType
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+# 템플릿 플레이스홀더 패턴 ({field_name})
+_PH_RE = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+_LINE_TAIL_RE = re.compile(r'[ \t]*\n?')
+
+# 입력과 무관한 고정 파생 필드 (구매범위, 개찰장소, 법적 결격사유 등)
+_CONST_DERIVED = {
+    "purchase_scope": "물품규격서 등 참조",
+    "opening_location": "국가종합전자조달시스템(나라장터)",
+    "legal_disqualification": (
+        "「국가를 당사자로 하는 계약에 관한 법률」제27조(부정당업자의 입찰참가 자격제한)에 "
+        "해당되지 아니한 업체"
+    ),
+    "tax_evasion_pledge": (
+        "「국가를 당사자로 하는 계약에 관한 법률」제27조의5 및 같은 법 시행령 제12조제3항에 따라 "
+        "'조세포탈 등을 한 자'로서 유죄판결이 확정된 날부터 2년이 지나지 아니한 자는 입찰에 참여할 수 없습니다."
+    ),
+    "same_price_handling": (
+        "낙찰이 될 수 있는 동일가격으로 견적 제출한 자가 2인 이상일 때에는 국가계약법 시행령 제47조 규정에 의거 낙찰자를 결정합니다."
+    ),
+}
+
+# 누락된 선택 필드 기본값 (TEMPLATE_PLACEHOLDER_RULES.md 참조)
+_DEFAULT_VALUES = MappingProxyType({
+    "organization": "발주기관명",
+    "contact_department": "담당부서",
+    "contact_person": "담당자명",
+    "contact_phone": "02-1234-5678",
+    "contact_email": "contact@example.go.kr",
+    "contact_address": "서울특별시...",
+    "qualification_detail": "별도 공고 참조",
+    "required_documents": "입찰공고문 참조",
+    "project_scope": "별도 과업지시서 참조",
+    "requirements": "별도 과업지시서 참조",
+    "deliverables": "별도 과업지시서 참조",
+    "technical_spec": "별도 과업지시서 참조",
+    # 필수 필드 안전장치
+    "qualification_review_target": "적격심사 제외대상입니다.",
+    "integrity_pledge_target": "청렴계약이행 서약제 대상입니다.",
+    "contract_method_detail": "일반경쟁(총액), 전자입찰대상 물품입니다.",
+    # delivery_deadline_days는 파생 필드에서 처리되므로 여기서는 제외
+})
+
+# 렌더링 후 남은 필수 플레이스홀더에 대한 안전장치 기본값
+_DEFAULT_FALLBACKS = MappingProxyType({
+    "qualification_review_target": "적격심사 제외대상입니다.",
+    "integrity_pledge_target": "청렴계약이행 서약제 대상입니다.",
+    "contract_method_detail": "일반경쟁(총액), 전자입찰대상 물품입니다.",
+})
 
 class FieldMapper:
     """
@@ -49,7 +100,8 @@ class FieldMapper:
     def map_extracted_to_template(
         self,
         extracted_data: Dict[str, Any],
-        template_placeholders: list
+        template_placeholders: list,
+        today: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         추출된 데이터를 템플릿 필드에 매핑
@@ -57,6 +109,7 @@ class FieldMapper:
         Args:
             extracted_data: Extractor Agent가 추출한 데이터
             template_placeholders: 템플릿의 플레이스홀더 리스트
+            today: 날짜 필드 계산 기준일 (기본값: 현재 시각)
 
         Returns:
             매핑된 필드 딕셔너리
@@ -69,7 +122,7 @@ class FieldMapper:
                 mapped_fields[template_key] = extracted_data[extracted_key]
 
         # 2. 파생 필드 생성
-        mapped_fields.update(self._generate_derived_fields(extracted_data))
+        mapped_fields.update(self._generate_derived_fields(extracted_data, today))
 
         # 3. 기본값 설정 (누락된 선택 필드)
         mapped_fields.update(self._set_default_values(template_placeholders, mapped_fields))
@@ -79,12 +132,18 @@ class FieldMapper:
 
         return mapped_fields
 
-    def _generate_derived_fields(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_derived_fields(
+        self,
+        extracted_data: Dict[str, Any],
+        today: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         추출 데이터로부터 파생 필드 생성
         
         완성본 공고문 기준으로 모든 필수 필드 생성
         TEMPLATE_FIELD_KEYS.md 참조
+
+        today를 지정하면 날짜 필드가 해당 기준일로 계산됩니다 (재현 가능한 출력).
         """
         derived = {}
 
@@ -118,7 +177,8 @@ class FieldMapper:
         # ===== 1. 입찰에 부치는 사항 =====
         
         # 날짜 관련 필드
-        today = datetime.now()
+        if today is None:
+            today = datetime.now()
         derived["announcement_date"] = today.strftime("%Y년 %m월 %d일")
         derived["announcement_number"] = f"공고 제{today.year}-{today.month:02d}-{today.day:02d}호"
         
@@ -142,10 +202,6 @@ class FieldMapper:
         else:
             derived["budget_amount"] = str(total_budget)
         
-        # 구매범위
-        item_name = extracted_data.get("item_name", "")
-        derived["purchase_scope"] = "물품규격서 등 참조"
-        
         # 전자입찰서 제출기간 (공고 방식에 따라 계산)
         if contract_method == "소액수의":
             # 소액수의: 3일 (공휴일 제외, 단순화: 3일)
@@ -163,7 +219,6 @@ class FieldMapper:
         # 개찰일시 및 장소
         opening_datetime = bid_end + timedelta(days=1)
         derived["opening_datetime"] = opening_datetime.strftime("%Y. %m. %d.(11:00)")
-        derived["opening_location"] = "국가종합전자조달시스템(나라장터)"
         
         # 하위 호환성 (기존 키)
         derived["bid_deadline"] = derived["bid_submission_end"]
@@ -306,15 +361,8 @@ class FieldMapper:
         else:
             derived["sme_restriction_detail"] = ""
         
-        # 법적 결격사유 (고정값)
-        derived["legal_disqualification"] = (
-            "「국가를 당사자로 하는 계약에 관한 법률」제27조(부정당업자의 입찰참가 자격제한)에 "
-            "해당되지 아니한 업체"
-        )
-        derived["tax_evasion_pledge"] = (
-            "「국가를 당사자로 하는 계약에 관한 법률」제27조의5 및 같은 법 시행령 제12조제3항에 따라 "
-            "'조세포탈 등을 한 자'로서 유죄판결이 확정된 날부터 2년이 지나지 아니한 자는 입찰에 참여할 수 없습니다."
-        )
+        # 법적 결격사유, 조세포탈 서약 등 고정 문구
+        derived.update(_CONST_DERIVED)
         
         # ===== 4. 공동계약 =====
         is_joint = extracted_data.get("is_joint_contract", False)
@@ -353,10 +401,6 @@ class FieldMapper:
             derived["estimated_price_method"] = ""
             derived["award_decision_method"] = "최저가 입찰자를 낙찰자로 결정합니다."
         
-        derived["same_price_handling"] = (
-            "낙찰이 될 수 있는 동일가격으로 견적 제출한 자가 2인 이상일 때에는 국가계약법 시행령 제47조 규정에 의거 낙찰자를 결정합니다."
-        )
-        
         # ===== 6. 적격심사 자료제출 =====
         if contract_method == "적격심사":
             derived["qualification_submission_deadline"] = "통보받은 날로부터 5일 이내"
@@ -368,10 +412,12 @@ class FieldMapper:
             derived["qualification_submission_method"] = ""
         
         # ===== 7. 기타 필수 필드 =====
-        derived["contact_department"] = extracted_data.get("contact_department", "경영지원처 계약부")
-        derived["contact_person"] = extracted_data.get("contact_person", "담당자")
-        derived["contact_phone"] = extracted_data.get("contact_phone", "032-590-0000")
-        derived["organization"] = extracted_data.get("organization", "한국환경공단")
+        derived.update({
+            "contact_department": extracted_data.get("contact_department", "경영지원처 계약부"),
+            "contact_person": extracted_data.get("contact_person", "담당자"),
+            "contact_phone": extracted_data.get("contact_phone", "032-590-0000"),
+            "organization": extracted_data.get("organization", "한국환경공단"),
+        })
         
         # 하위 호환성 (기존 키)
         derived["item_name"] = derived["announcement_name"]
@@ -422,8 +468,6 @@ class FieldMapper:
 
         예: "6개월" -> 180일, "90일" -> 90
         """
-        import re
-
         # "N개월" 형태
         month_match = re.search(r'(\d+)\s*개월', str(period_str))
         if month_match:
@@ -453,35 +497,12 @@ class FieldMapper:
         Returns:
             기본값이 설정된 필드
         """
-        defaults = {}
-
-        # 기본값 정의 (TEMPLATE_PLACEHOLDER_RULES.md 참조)
-        default_values = {
-            "organization": "발주기관명",
-            "contact_department": "담당부서",
-            "contact_person": "담당자명",
-            "contact_phone": "02-1234-5678",
-            "contact_email": "contact@example.go.kr",
-            "contact_address": "서울특별시...",
-            "qualification_detail": "별도 공고 참조",
-            "required_documents": "입찰공고문 참조",
-            "project_scope": "별도 과업지시서 참조",
-            "requirements": "별도 과업지시서 참조",
-            "deliverables": "별도 과업지시서 참조",
-            "technical_spec": "별도 과업지시서 참조",
-            # 필수 필드 안전장치
-            "qualification_review_target": "적격심사 제외대상입니다.",
-            "integrity_pledge_target": "청렴계약이행 서약제 대상입니다.",
-            "contract_method_detail": "일반경쟁(총액), 전자입찰대상 물품입니다.",
-            # delivery_deadline_days는 파생 필드에서 처리되므로 여기서는 제외
+        return {
+            placeholder: _DEFAULT_VALUES[placeholder]
+            for placeholder in template_placeholders
+            if placeholder not in mapped_fields and placeholder in _DEFAULT_VALUES
         }
 
-        for placeholder in template_placeholders:
-            if placeholder not in mapped_fields and placeholder in default_values:
-                defaults[placeholder] = default_values[placeholder]
-
-        return defaults
-
     def _validate_required_fields(
         self,
         mapped_fields: Dict[str, Any],
@@ -513,7 +534,8 @@ class FieldMapper:
     def fill_template(
         self,
         template_content: str,
-        extracted_data: Dict[str, Any]
+        extracted_data: Dict[str, Any],
+        today: Optional[datetime] = None
     ) -> str:
         """
         Document Assembly: 템플릿에 추출 데이터를 채워서 반환
@@ -526,52 +548,50 @@ class FieldMapper:
         Args:
             template_content: 템플릿 원본 내용 (마크다운 형식)
             extracted_data: 추출된 데이터 (ExtractedData + Classification)
+            today: 날짜 필드 계산 기준일 (기본값: 현재 시각)
 
         Returns:
             데이터가 채워진 템플릿 문자열 (완성된 공고문)
         """
-        import re
+        if today is None:
+            today = datetime.now()
 
-        # 플레이스홀더 추출
-        placeholders = re.findall(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}', template_content)
-        placeholders = list(set(placeholders))
+        # 플레이스홀더 추출 (등장 순서 유지, 중복 제거)
+        placeholders = list(dict.fromkeys(_PH_RE.findall(template_content)))
 
         # 데이터 매핑
-        mapped_fields = self.map_extracted_to_template(extracted_data, placeholders)
-
-        # 템플릿 채우기
-        filled_content = template_content
-        for key, value in mapped_fields.items():
-            placeholder = f"{{{key}}}"
-            # 빈 문자열인 경우 (qualification_notes 등) 해당 라인 제거
-            if value == "" and key == "qualification_notes":
-                # qualification_notes가 빈 문자열이면 해당 라인 제거
-                import re
-                pattern = rf"\{re.escape(placeholder)}\s*\n?"
-                filled_content = re.sub(pattern, "", filled_content)
-            else:
-                filled_content = filled_content.replace(placeholder, str(value))
-
-        # 남은 플레이스홀더 처리 (안전장치)
-        remaining_placeholders = re.findall(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}', filled_content)
-        if remaining_placeholders:
-            # 필수 필드에 대한 기본값 적용
-            default_fallbacks = {
-                "qualification_review_target": "적격심사 제외대상입니다.",
-                "integrity_pledge_target": "청렴계약이행 서약제 대상입니다.",
-                "contract_method_detail": "일반경쟁(총액), 전자입찰대상 물품입니다.",
-            }
-            
-            for placeholder in set(remaining_placeholders):
-                if placeholder in default_fallbacks:
-                    filled_content = filled_content.replace(
-                        f"{{{placeholder}}}",
-                        default_fallbacks[placeholder]
-                    )
+        mapped_fields = self.map_extracted_to_template(extracted_data, placeholders, today)
+
+        # 템플릿 채우기: 템플릿을 한 번만 순회하며 리터럴 구간과 치환값을 버퍼에 기록
+        # (str.replace 반복으로 인한 전체 문자열 중간 복사본을 만들지 않음)
+        buf = io.StringIO()
+        pos = 0
+        unfilled = []
+        for match in _PH_RE.finditer(template_content):
+            buf.write(template_content[pos:match.start()])
+            pos = match.end()
+            key = match.group(1)
+
+            if key in mapped_fields:
+                value = mapped_fields[key]
+                # qualification_notes가 빈 문자열이면 해당 라인 제거 (뒤따르는 개행 포함)
+                if value == "" and key == "qualification_notes":
+                    pos = _LINE_TAIL_RE.match(template_content, pos).end()
                 else:
-                    print(f"⚠️ 경고: 다음 플레이스홀더가 채워지지 않았습니다: {placeholder}")
+                    buf.write(str(value))
+            elif key in _DEFAULT_FALLBACKS:
+                # 남은 필수 플레이스홀더 안전장치
+                buf.write(_DEFAULT_FALLBACKS[key])
+            else:
+                buf.write(match.group(0))
+                if key not in unfilled:
+                    unfilled.append(key)
+        buf.write(template_content[pos:])
+
+        for placeholder in unfilled:
+            print(f"⚠️ 경고: 다음 플레이스홀더가 채워지지 않았습니다: {placeholder}")
 
-        return filled_content
+        return buf.getvalue()
 
 
 # Singleton 인스턴스
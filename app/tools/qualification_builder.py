@@ -23,6 +23,20 @@ class QualificationBuilder:
     입찰참가자격 섹션을 자동 생성합니다.
     """
 
+    # ① G2B 기본 등록 요건 (고정 문구)
+    G2B_REQUIREMENT = """### ① G2B 기본 등록 요건
+
+국가종합전자조달시스템 입찰참가자격등록규정에 따라
+전자입찰서 제출 마감일 전일까지
+나라장터(G2B)에 입찰참가자격을 등록한 자"""
+
+    # ④ 법적 결격사유 배제 (고정 문구)
+    LEGAL_DISQUALIFICATION = """### ④ 법적 결격사유 배제
+
+국가계약법 제27조 및 동법 시행령 제37조에 따른 입찰 참가자격이 있는 자
+- 조세포탈, 부정수급 등 법령 위반으로 제재를 받은 자는 제외
+- 부정당업자로 등록된 자는 제외"""
+
     def __init__(self):
         self.industry_api = get_industry_api_client()
 
@@ -41,10 +55,8 @@ class QualificationBuilder:
         Returns:
             입찰참가자격 블록 마크다운 텍스트
         """
-        blocks = []
-        
         # ① G2B 기본 등록 요건 (고정)
-        blocks.append(self._build_g2b_requirement())
+        blocks = [self.G2B_REQUIREMENT]
         
         # ② 물품/업종 요건 (분기)
         industry_block = self._build_industry_requirement(extracted_data)
@@ -57,23 +69,10 @@ class QualificationBuilder:
             blocks.append(sme_block)
         
         # ④ 법적 결격사유 (고정)
-        blocks.append(self._build_legal_disqualification())
+        blocks.append(self.LEGAL_DISQUALIFICATION)
         
         return "\n\n".join(blocks)
 
-    def _build_g2b_requirement(self) -> str:
-        """
-        ① G2B 기본 등록 요건 (고정 문구)
-        
-        Returns:
-            G2B 기본 요건 텍스트
-        """
-        return """### ① G2B 기본 등록 요건
-
-국가종합전자조달시스템 입찰참가자격등록규정에 따라
-전자입찰서 제출 마감일 전일까지
-나라장터(G2B)에 입찰참가자격을 등록한 자"""
-
     def _build_industry_requirement(
         self,
         extracted_data: Dict[str, Any]
@@ -150,19 +149,6 @@ class QualificationBuilder:
 
 {restriction_text}에 해당하는 기업만 입찰 참가 가능"""
 
-    def _build_legal_disqualification(self) -> str:
-        """
-        ④ 법적 결격사유 배제 (고정 문구)
-        
-        Returns:
-            법적 결격사유 텍스트
-        """
-        return """### ④ 법적 결격사유 배제
-
-국가계약법 제27조 및 동법 시행령 제37조에 따른 입찰 참가자격이 있는 자
-- 조세포탈, 부정수급 등 법령 위반으로 제재를 받은 자는 제외
-- 부정당업자로 등록된 자는 제외"""
-
     def _get_industry_info(self, industry_code: str) -> Optional[Dict[str, str]]:
         """
         업종코드로 업종 정보 조회
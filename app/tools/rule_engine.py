@@ -4,8 +4,23 @@ Rule Engine for Procurement Classification
 국가계약법 기반 공고 유형 분류 규칙 엔진
 """
 
-from typing import Dict, Any, Tuple, Optional
+import logging
+import re
+import time
+from typing import Dict, Tuple, Optional
 from app.models.schemas import ExtractedData, ClassificationResult
+from app.utils.notice_amount_crawler import get_latest_notice_amount
+
+logger = logging.getLogger(__name__)
+
+
+def _technical_requirements(data: ExtractedData) -> Optional[str]:
+    """자격 요건의 기술 요건 텍스트 반환 (없으면 None)"""
+    return data.qualification.technical_requirements if data.qualification else None
+
+
+# 협상계약 판단용 특수/전문 기술 키워드
+_SPECIAL_KEYWORDS_RE = re.compile("특수|전문")
 
 
 class ProcurementRuleEngine:
@@ -46,12 +61,17 @@ class ProcurementRuleEngine:
         "중소기업_최대": 230_000_000,      # 고시금액 미만 (동적 업데이트)
     }
 
+    # 고시금액 재확인 주기 (초) - 고시금액은 2년 주기로 변경됨
+    _NOTICE_TTL_SEC = 3600
+
     def __init__(self):
         self.rules = [
             self._rule_qualification_review,
             self._rule_lowest_price,
             self._rule_negotiation
         ]
+        # 마지막 고시금액 갱신 시각 (time.monotonic 기준, None이면 미갱신)
+        self._notice_last_refresh: Optional[float] = None
         # 고시금액 초기화 (크롤링)
         self._update_notice_amount()
 
@@ -73,6 +93,10 @@ class ProcurementRuleEngine:
         estimated_price_exc_vat = self._calculate_estimated_price_exc_vat(total_budget)
         
         proc_type = extracted_data.procurement_type
+        
+        # 조달 유형별 금액 기준 (한 번만 조회하여 재사용)
+        thresholds = self.THRESHOLDS.get(proc_type) or {}
+        small_max = thresholds.get("소액수의_최대", 0)
 
         # 1차 분기: 공고 방식 결정 (Rule Engine 기반)
         # 제한경쟁입찰 등 특수 케이스 먼저 확인
@@ -92,8 +116,9 @@ class ProcurementRuleEngine:
         # 최종 공고 유형 결정
         recommended_type = self._build_announcement_type(contract_method, contract_nature)
         
+        price_str = f"{estimated_price_exc_vat:,.0f}"
         reason = (
-            f"추정가격 {estimated_price_exc_vat:,.0f}원 기준 "
+            f"추정가격 {price_str}원 기준 "
             f"{contract_method} 선택, {contract_nature}"
         )
         
@@ -108,14 +133,14 @@ class ProcurementRuleEngine:
             "total_budget_vat": total_budget,
             "procurement_type": proc_type,
             "threshold_used": {
-                "소액수의_최대": self.THRESHOLDS.get(proc_type, {}).get("소액수의_최대"),
-                "별표1_최소": self.THRESHOLDS.get(proc_type, {}).get("별표1_최소"),
-                "별표2_최소": self.THRESHOLDS.get(proc_type, {}).get("별표2_최소"),
-                "별표3_최소": self.THRESHOLDS.get(proc_type, {}).get("별표3_최소"),
+                "소액수의_최대": thresholds.get("소액수의_최대"),
+                "별표1_최소": thresholds.get("별표1_최소"),
+                "별표2_최소": thresholds.get("별표2_최소"),
+                "별표3_최소": thresholds.get("별표3_최소"),
             },
             "calculation_steps": [
-                f"VAT 제외 추정가격: {total_budget:,.0f} / 1.1 = {estimated_price_exc_vat:,.0f}원",
-                f"공고 방식 판단: {estimated_price_exc_vat:,.0f}원 {'<=' if estimated_price_exc_vat <= self.THRESHOLDS.get(proc_type, {}).get('소액수의_최대', 0) else '>'} {self.THRESHOLDS.get(proc_type, {}).get('소액수의_최대', 0):,}원 → {contract_method}",
+                f"VAT 제외 추정가격: {total_budget:,.0f} / 1.1 = {price_str}원",
+                f"공고 방식 판단: {price_str}원 {'<=' if estimated_price_exc_vat <= small_max else '>'} {small_max:,}원 → {contract_method}",
             ],
             "contract_nature": contract_nature,
             "applied_annex": applied_annex,
@@ -124,12 +149,12 @@ class ProcurementRuleEngine:
         
         if applied_annex:
             reason_trace["calculation_steps"].append(
-                f"별표 결정: {estimated_price_exc_vat:,.0f}원 기준 → {applied_annex} 적용"
+                f"별표 결정: {price_str}원 기준 → {applied_annex} 적용"
             )
         
         if sme_restriction != "없음":
             reason_trace["calculation_steps"].append(
-                f"중소기업 제한: {estimated_price_exc_vat:,.0f}원 기준 → {sme_restriction}"
+                f"중소기업 제한: {price_str}원 기준 → {sme_restriction}"
             )
 
         return ClassificationResult(
@@ -215,19 +240,27 @@ class ProcurementRuleEngine:
         """
         기획재정부 고시금액을 크롤링하여 업데이트
         
-        공고문 생성 시마다 최신 고시금액을 확인합니다.
+        공고문 생성 시 최신 고시금액을 확인하되, 마지막 갱신 후
+        _NOTICE_TTL_SEC 이내에는 크롤러를 호출하지 않습니다.
         """
+        now = time.monotonic()
+        if (
+            self._notice_last_refresh is not None
+            and now - self._notice_last_refresh < self._NOTICE_TTL_SEC
+        ):
+            return
+
         try:
-            from app.utils.notice_amount_crawler import get_latest_notice_amount
             notice_amount = get_latest_notice_amount(force_refresh=False)
             if notice_amount:
                 self.SME_THRESHOLDS["중소기업_최대"] = notice_amount
                 # 별표2 최소값도 업데이트
                 for proc_type in self.THRESHOLDS:
                     self.THRESHOLDS[proc_type]["별표2_최소"] = notice_amount
-                print(f"✅ 고시금액 업데이트: {notice_amount:,}원")
+                self._notice_last_refresh = now
+                logger.info(f"✅ 고시금액 업데이트: {notice_amount:,}원")
         except Exception as e:
-            print(f"⚠️ 고시금액 크롤링 실패, 기본값 사용: {str(e)}")
+            logger.warning(f"⚠️ 고시금액 크롤링 실패, 기본값 사용: {str(e)}")
             # 기본값 유지
     
     def _determine_sme_restriction(self, estimated_price: float) -> str:
@@ -245,7 +278,7 @@ class ProcurementRuleEngine:
         Returns:
             "소기업_소상공인", "중소기업_소상공인", "없음"
         """
-        # 고시금액 최신화 (매번 확인)
+        # 고시금액 최신화 (TTL 경과 시에만 재확인)
         self._update_notice_amount()
         
         notice_amount = self.SME_THRESHOLDS["중소기업_최대"]
@@ -344,7 +377,7 @@ class ProcurementRuleEngine:
             reason = "금액이 적격심사 기준 미만"
 
         # 기술력 중요 여부 확인
-        if data.qualification and data.qualification.technical_requirements:
+        if _technical_requirements(data):
             confidence = min(confidence + 0.1, 1.0)
             reason += " (기술력 요건 있음)"
 
@@ -380,7 +413,7 @@ class ProcurementRuleEngine:
             reason = "금액이 높아 적격심사 권장"
 
         # 단순 물품인 경우 신뢰도 증가
-        if proc_type == "물품" and not (data.qualification and data.qualification.technical_requirements):
+        if proc_type == "물품" and not _technical_requirements(data):
             confidence = min(confidence + 0.1, 1.0)
             reason += " (단순 물품)"
 
@@ -406,14 +439,16 @@ class ProcurementRuleEngine:
         reason = "일반적인 경우 경쟁입찰 우선"
 
         # 특수 기술 요구
-        if data.qualification and data.qualification.technical_requirements:
-            if "특수" in data.qualification.technical_requirements or "전문" in data.qualification.technical_requirements:
+        tech_req = _technical_requirements(data)
+        if tech_req:
+            if _SPECIAL_KEYWORDS_RE.search(tech_req) is not None:
                 confidence = 0.7
                 reason = "특수 기술 요구사항 있음"
 
         # 용역이면서 고도의 전문성 필요
         if proc_type == "용역":
-            if data.qualification_notes and ("전문" in data.qualification_notes or "특수" in data.qualification_notes):
+            notes = data.qualification_notes
+            if notes and _SPECIAL_KEYWORDS_RE.search(notes if isinstance(notes, str) else str(notes)) is not None:
                 confidence = max(confidence, 0.6)
                 reason = "전문 용역으로 협상계약 고려 가능"
 
@@ -4,10 +4,41 @@ Template Selector Tool
 공고 유형에 맞는 템플릿을 선택하는 도구
 """
 
+import os
+import re
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple
 from app.models.schemas import DocumentTemplate, ClassificationResult
 
+# 템플릿 플레이스홀더 패턴 ({field_name})
+_PLACEHOLDER_RE = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+
+# 템플릿 매핑 (공고 방식 기반)
+# 우선순위: HWPX > PDF > MD
+_TEMPLATE_MAPPING = MappingProxyType({
+    "소액수의": MappingProxyType({
+        "hwpx": "lowest_price.hwpx",
+        "pdf": "lowest_price.pdf",
+        "md": "lowest_price.md"
+    }),
+    "적격심사": MappingProxyType({
+        "hwpx": "qualification_review.hwpx",
+        "pdf": "qualification_review.pdf",
+        "md": "qualification_review.md"
+    }),
+    "최저가낙찰": MappingProxyType({
+        "hwpx": "lowest_price.hwpx",
+        "pdf": "lowest_price.pdf",
+        "md": "lowest_price.md"
+    }),
+    "협상계약": MappingProxyType({
+        "hwpx": "negotiation.hwpx",
+        "pdf": "negotiation.pdf",
+        "md": "negotiation.md"
+    }),
+})
+
 
 class TemplateSelector:
     """템플릿 선택 도구"""
@@ -23,30 +54,11 @@ class TemplateSelector:
         else:
             self.templates_dir = Path(templates_dir)
 
-        # 템플릿 매핑 (공고 방식 기반)
-        # 우선순위: HWPX > PDF > MD
-        self.template_mapping = {
-            "소액수의": {
-                "hwpx": "lowest_price.hwpx",
-                "pdf": "lowest_price.pdf",
-                "md": "lowest_price.md"
-            },
-            "적격심사": {
-                "hwpx": "qualification_review.hwpx",
-                "pdf": "qualification_review.pdf",
-                "md": "qualification_review.md"
-            },
-            "최저가낙찰": {
-                "hwpx": "lowest_price.hwpx",
-                "pdf": "lowest_price.pdf",
-                "md": "lowest_price.md"
-            },
-            "협상계약": {
-                "hwpx": "negotiation.hwpx",
-                "pdf": "negotiation.pdf",
-                "md": "negotiation.md"
-            }
-        }
+        # 템플릿 매핑 (공고 방식 기반, 읽기 전용 공유 상수)
+        self.template_mapping = _TEMPLATE_MAPPING
+
+        # 선택된 템플릿 캐시: (공고 유형, 선호 형식) -> (파일 mtime, DocumentTemplate)
+        self._cache: Dict[Tuple[str, str], Tuple[float, DocumentTemplate]] = {}
 
     def select_template(
         self,
@@ -61,7 +73,7 @@ class TemplateSelector:
             preferred_format: 선호하는 템플릿 형식 (hwpx, pdf, md)
 
         Returns:
-            DocumentTemplate: 선택된 템플릿
+            DocumentTemplate: 선택된 템플릿 (캐시된 템플릿의 복사본)
         """
         template_type = classification_result.recommended_type
         template_files = self.template_mapping.get(template_type)
@@ -69,17 +81,44 @@ class TemplateSelector:
         if template_files is None:
             raise ValueError(f"Unknown template type: {template_type}")
 
+        # 캐시 확인 (파일이 변경되지 않았으면 경로 탐색/파일 읽기 생략)
+        cache_key = (template_type, preferred_format)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            cached_mtime, cached_template = cached
+            try:
+                if Path(cached_template.template_path).stat().st_mtime == cached_mtime:
+                    # 호출 측에서 수정해도 캐시에 영향이 없도록 복사본 반환
+                    return cached_template.model_copy(deep=True)
+            except OSError:
+                pass
+            self._cache.pop(cache_key, None)
+
         # 우선순위에 따라 템플릿 파일 찾기
+        # exists() 후 open() 하지 않고 바로 열어 시도 (형식당 파일 시스템 호출 1회)
         template_path = None
         template_format = None
-        
+        template_mtime = None
+        content = None
+
         for fmt in [preferred_format, "hwpx", "pdf", "md"]:
-            if fmt in template_files:
-                candidate_path = self.templates_dir / template_files[fmt]
-                if candidate_path.exists():
-                    template_path = candidate_path
-                    template_format = fmt
-                    break
+            if fmt not in template_files:
+                continue
+            candidate_path = self.templates_dir / template_files[fmt]
+            try:
+                if fmt == "md":
+                    with open(candidate_path, 'r', encoding='utf-8') as f:
+                        template_mtime = os.fstat(f.fileno()).st_mtime
+                        content = f.read()
+                else:
+                    # HWPX/PDF는 바이너리 파일이므로 content는 경로만 저장
+                    template_mtime = candidate_path.stat().st_mtime
+                    content = str(candidate_path)
+            except FileNotFoundError:
+                continue
+            template_path = candidate_path
+            template_format = fmt
+            break
         
         if template_path is None:
             raise FileNotFoundError(
@@ -87,17 +126,12 @@ class TemplateSelector:
                 f"Checked formats: {list(template_files.keys())}"
             )
 
-        # 템플릿 파일 읽기 (형식에 따라 다름)
         if template_format == "md":
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
             placeholders = self._extract_placeholders(content)
         else:
-            # HWPX/PDF는 바이너리 파일이므로 content는 경로만 저장
-            content = str(template_path)
             placeholders = []  # 파란색 텍스트에서 추출
 
-        return DocumentTemplate(
+        template = DocumentTemplate(
             template_id=f"template_{template_type}_{template_format}",
             template_type=template_type,
             content=content,
@@ -105,6 +139,9 @@ class TemplateSelector:
             template_format=template_format,  # 추가 필드
             template_path=str(template_path)  # 추가 필드
         )
+        self._cache[cache_key] = (template_mtime, template.model_copy(deep=True))
+
+        return template
 
     def select_template_by_type(self, template_type: str) -> DocumentTemplate:
         """
@@ -116,8 +153,6 @@ class TemplateSelector:
         Returns:
             DocumentTemplate: 선택된 템플릿
         """
-        from app.models.schemas import ClassificationResult
-
         # Dummy classification result
         dummy_classification = ClassificationResult(
             recommended_type=template_type,
@@ -139,10 +174,7 @@ class TemplateSelector:
         Returns:
             플레이스홀더 리스트
         """
-        import re
-        pattern = r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}'
-        matches = re.findall(pattern, content)
-        return list(set(matches))  # 중복 제거
+        return list(dict.fromkeys(_PLACEHOLDER_RE.findall(content)))  # 중복 제거 (등장 순서 유지)
 
     def list_available_templates(self) -> list:
         """
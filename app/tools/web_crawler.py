@@ -5,15 +5,30 @@ CrewAI Agent가 웹 페이지를 크롤링할 수 있도록 하는 Tool입니다
 """
 
 import requests
-from bs4 import BeautifulSoup
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from bs4.dammit import EncodingDetector, UnicodeDammit
+import codecs
+import lxml.html
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 from urllib.parse import urljoin, urlparse
+import re
 import time
 import json
+import threading
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 from crewai_tools import tool
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 # User-Agent 설정 (봇 차단 방지)
@@ -21,36 +36,196 @@ DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# 여러 페이지 크롤링 시 동시에 처리할 최대 호스트 수
+MAX_CRAWL_WORKERS = 5
 
-@tool("웹 페이지 크롤링 도구")
-def crawl_web_page(url: str, extract_text: bool = True, extract_links: bool = False) -> str:
+
+def _create_session() -> requests.Session:
+    """Keep-Alive 연결을 재사용하는 HTTP 세션 생성"""
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# 도구 호출 간 공유하는 HTTP 세션 (같은 호스트 재요청 시 TCP/TLS 핸드셰이크 생략)
+_SESSION = _create_session()
+
+# 같은 호스트에 대한 요청 최소 간격 (초, 서버 부하 방지)
+HOST_MIN_INTERVAL_SEC = 0.5
+
+# 호스트별 마지막 요청 시각 (time.monotonic 기준)
+_LAST_HIT: Dict[str, float] = {}
+_LAST_HIT_LOCK = threading.Lock()
+
+
+def _wait_for_host(url: str) -> None:
+    """같은 호스트 요청이 HOST_MIN_INTERVAL_SEC 간격을 두도록 대기 (다른 호스트는 대기 없음)"""
+    host = urlparse(url).netloc
+    with _LAST_HIT_LOCK:
+        now = time.monotonic()
+        start_at = max(now, _LAST_HIT.get(host, 0.0) + HOST_MIN_INTERVAL_SEC)
+        # 최소 간격이 지난 호스트는 더 이상 대기할 필요가 없으므로 제거
+        for stale in [h for h, hit in _LAST_HIT.items() if hit + HOST_MIN_INTERVAL_SEC <= now]:
+            del _LAST_HIT[stale]
+        _LAST_HIT[host] = start_at
+    if start_at > now:
+        time.sleep(start_at - now)
+
+
+# 응답 본문 최대 크기 (초과분은 읽지 않음)
+MAX_RESPONSE_BYTES = 2_000_000
+
+# 파싱 대상 Content-Type (그 외 바이너리 등은 다운로드하지 않음)
+_HTML_CONTENT_TYPES = ("text/", "application/xhtml")
+
+
+def _dumps_json(data: Dict[str, Any]) -> str:
+    """크롤링 결과를 들여쓴 JSON 문자열로 직렬화 (orjson 설치 시 사용)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+# 줄바꿈을 포함한 공백 구간 (줄 앞뒤 공백과 빈 줄을 한 번에 정리)
+_LINE_BREAK_WS_RE = re.compile(r'\s*\n\s*')
+
+
+def _fetch_html(
+    url: str,
+    headers: Optional[Dict[str, str]] = None
+) -> Tuple[requests.Response, bytes]:
     """
-    웹 페이지를 크롤링하여 내용을 추출합니다.
+    URL의 HTML 본문을 스트리밍으로 최대 MAX_RESPONSE_BYTES까지만 읽기
     
     Args:
-        url: 크롤링할 웹 페이지 URL
-        extract_text: 텍스트 추출 여부 (기본값: True)
-        extract_links: 링크 추출 여부 (기본값: False)
+        url: 요청 URL
+        headers: 추가 요청 헤더 (조건부 요청용 If-None-Match 등)
     
     Returns:
-        크롤링된 내용 (JSON 형식 문자열)
+        (응답 객체, 본문 bytes)
+    
+    Raises:
+        requests.exceptions.RequestException: HTTP 요청 실패
+        ValueError: HTML(텍스트) 문서가 아닌 경우
+    """
+    _wait_for_host(url)
+    with _SESSION.get(url, headers=headers, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        
+        content_type = response.headers.get("Content-Type", "").lower()
+        if content_type and not content_type.startswith(_HTML_CONTENT_TYPES):
+            raise ValueError(f"HTML 문서가 아닙니다 (Content-Type: {content_type})")
+        
+        chunks = []
+        total = 0
+        for chunk in response.iter_content(65536):
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= MAX_RESPONSE_BYTES:
+                logger.warning(f"응답 본문이 {MAX_RESPONSE_BYTES:,}바이트를 초과하여 잘라냅니다: {url}")
+                break
+    
+    return response, b"".join(chunks)[:MAX_RESPONSE_BYTES]
+
+
+# 크롤링 결과 캐시 (에이전트 실행 중 같은 URL 반복 요청 방지)
+CRAWL_CACHE_TTL_SEC = 300
+CRAWL_CACHE_MAXSIZE = 256
+
+_CrawlCacheEntry = namedtuple("_CrawlCacheEntry", "stored_at result validators")
+_crawl_cache: "OrderedDict[Tuple[str, bool, bool], _CrawlCacheEntry]" = OrderedDict()
+_crawl_cache_lock = threading.Lock()
+
+
+def _crawl_cache_get(key: Tuple[str, bool, bool]) -> Optional[_CrawlCacheEntry]:
+    """캐시 항목 조회 (TTL이 지난 항목도 조건부 재요청을 위해 반환)"""
+    with _crawl_cache_lock:
+        entry = _crawl_cache.get(key)
+        if entry is not None:
+            _crawl_cache.move_to_end(key)
+        return entry
+
+
+def _crawl_cache_put(key: Tuple[str, bool, bool], result: Dict[str, Any], validators: Dict[str, str]) -> None:
+    """캐시 항목 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+    with _crawl_cache_lock:
+        _crawl_cache[key] = _CrawlCacheEntry(time.monotonic(), result, validators)
+        _crawl_cache.move_to_end(key)
+        if len(_crawl_cache) > CRAWL_CACHE_MAXSIZE:
+            _crawl_cache.popitem(last=False)
+
+
+def _conditional_headers(response: requests.Response) -> Dict[str, str]:
+    """응답의 ETag/Last-Modified로 다음 조건부 요청 헤더 생성"""
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = response.headers["Last-Modified"]
+    return validators
+
+
+def _parse_lxml(content: bytes, content_type: str = "") -> lxml.html.HtmlElement:
+    """
+    HTML을 lxml 트리로 직접 파싱
+    
+    인코딩 우선순위: Content-Type 헤더의 charset > 문서 내 meta 선언 > 본문 추정 > UTF-8
+    (lxml은 bytes 입력 시 meta가 늦게 나오면 Latin-1로 해석하므로 명시적으로 지정,
+    선언이 없는 EUC-KR 페이지는 UnicodeDammit으로 추정)
+    """
+    if not content.strip():
+        # 빈 문서는 lxml이 ParserError를 내므로 빈 트리로 처리
+        return lxml.html.Element("html")
+    
+    encoding = None
+    if "charset=" in content_type.lower():
+        encoding = content_type.lower().split("charset=", 1)[1].split(";", 1)[0].strip(' "\'')
+    if not encoding:
+        encoding = EncodingDetector.find_declared_encoding(content, is_html=True)
+    if not encoding:
+        encoding = UnicodeDammit(content, is_html=True).original_encoding
+    try:
+        codecs.lookup(encoding or "")
+    except LookupError:
+        encoding = "utf-8"
+    parser = lxml.html.HTMLParser(encoding=encoding)
+    return lxml.html.fromstring(content, parser=parser)
+
+
+def _crawl_impl(url: str, extract_text: bool = True, extract_links: bool = False) -> Dict[str, Any]:
+    """
+    웹 페이지 크롤링 (JSON 직렬화 없이 dict 반환)
+    
+    같은 (URL, 옵션) 요청은 CRAWL_CACHE_TTL_SEC 동안 캐시된 결과를 반환합니다.
+    
+    Returns:
+        크롤링 결과 dict (실패 시 {"url": ..., "error": "❌ ..."})
     """
     try:
         # URL 유효성 검사
         parsed = urlparse(url)
         if not parsed.scheme or not parsed.netloc:
-            return f"❌ 잘못된 URL 형식: {url}"
+            return {"url": url, "error": f"❌ 잘못된 URL 형식: {url}"}
         
-        # HTTP 요청
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=10)
-        response.raise_for_status()
+        # 캐시 확인 (TTL 이내면 요청 생략, 만료됐으면 조건부 요청)
+        cache_key = (url, extract_text, extract_links)
+        cached = _crawl_cache_get(cache_key)
+        if cached is not None and time.monotonic() - cached.stored_at < CRAWL_CACHE_TTL_SEC:
+            return cached.result
+        
+        # HTTP 요청 (본문 크기 제한)
+        response, body = _fetch_html(url, headers=cached.validators if cached else None)
         
-        # 인코딩 확인
-        if response.encoding is None:
-            response.encoding = 'utf-8'
+        # 변경되지 않음 (304): 다운로드/파싱 없이 캐시된 결과 재사용
+        if response.status_code == 304 and cached is not None:
+            _crawl_cache_put(cache_key, cached.result, cached.validators)
+            return cached.result
         
         # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = _parse_lxml(body, response.headers.get("Content-Type", ""))
         
         result = {
             "url": url,
@@ -61,50 +236,71 @@ def crawl_web_page(url: str, extract_text: bool = True, extract_links: bool = Fa
         }
         
         # 제목 추출
-        title_tag = soup.find('title')
-        if title_tag:
-            result["title"] = title_tag.get_text(strip=True)
+        title_tag = tree.find('.//title')
+        if title_tag is not None:
+            result["title"] = "".join(t.strip() for t in title_tag.itertext())
         
         # 텍스트 추출
         if extract_text:
-            # 스크립트와 스타일 태그 제거
-            for script in soup(["script", "style", "meta", "link"]):
-                script.decompose()
+            # 스크립트와 스타일 등 비본문 태그를 한 번의 트리 순회로 제거
+            etree.strip_elements(tree, 'script', 'style', 'meta', 'link', 'noscript', with_tail=False)
             
-            # 본문 텍스트 추출
-            text = soup.get_text(separator='\n', strip=True)
+            # 본문 텍스트 추출 (텍스트 노드 단위로 줄바꿈)
+            text = '\n'.join(tree.itertext())
             # 연속된 공백 제거
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            result["text"] = '\n'.join(lines[:1000])  # 최대 1000줄로 제한
+            text = _LINE_BREAK_WS_RE.sub('\n', text).strip()
+            result["text"] = '\n'.join(text.split('\n', 1000)[:1000])  # 최대 1000줄로 제한
         
         # 링크 추출
         if extract_links:
             links = []
-            for link in soup.find_all('a', href=True):
+            for link in tree.iterfind('.//a[@href]'):
+                if len(links) >= 50:  # 최대 50개 링크 (나머지는 순회하지 않음)
+                    break
                 href = link.get('href')
-                text = link.get_text(strip=True)
+                text = "".join(t.strip() for t in link.itertext())
                 # 상대 URL을 절대 URL로 변환
                 absolute_url = urljoin(url, href)
                 links.append({
                     "url": absolute_url,
                     "text": text
                 })
-            result["links"] = links[:50]  # 최대 50개 링크
+            result["links"] = links
         
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        _crawl_cache_put(cache_key, result, _conditional_headers(response))
+        return result
         
     except requests.exceptions.RequestException as e:
         logger.error(f"웹 크롤링 요청 실패: {str(e)}")
-        return f"❌ 웹 크롤링 실패: {str(e)}"
+        return {"url": url, "error": f"❌ 웹 크롤링 실패: {str(e)}"}
     except Exception as e:
         logger.error(f"웹 크롤링 중 오류 발생: {str(e)}")
-        return f"❌ 오류 발생: {str(e)}"
+        return {"url": url, "error": f"❌ 오류 발생: {str(e)}"}
+
+
+@tool("웹 페이지 크롤링 도구")
+def crawl_web_page(url: str, extract_text: bool = True, extract_links: bool = False) -> str:
+    """
+    웹 페이지를 크롤링하여 내용을 추출합니다.
+    
+    Args:
+        url: 크롤링할 웹 페이지 URL
+        extract_text: 텍스트 추출 여부 (기본값: True)
+        extract_links: 링크 추출 여부 (기본값: False)
+    
+    Returns:
+        크롤링된 내용 (JSON 형식 문자열)
+    """
+    result = _crawl_impl(url, extract_text=extract_text, extract_links=extract_links)
+    if "error" in result:
+        return result["error"]
+    return _dumps_json(result)
 
 
 @tool("여러 웹 페이지 크롤링 도구")
 def crawl_multiple_pages(urls: str, extract_text: bool = True) -> str:
     """
-    여러 웹 페이지를 순차적으로 크롤링합니다.
+    여러 웹 페이지를 크롤링합니다. (서로 다른 호스트는 병렬, 같은 호스트는 순차)
     
     Args:
         urls: 크롤링할 URL 목록 (쉼표로 구분된 문자열 또는 JSON 배열 문자열)
@@ -125,35 +321,45 @@ def crawl_multiple_pages(urls: str, extract_text: bool = True) -> str:
         if not url_list:
             return "❌ URL 목록이 비어있습니다."
         
-        results = []
-        for i, url in enumerate(url_list[:10], 1):  # 최대 10개 URL
-            logger.info(f"크롤링 중 ({i}/{len(url_list)}): {url}")
-            
-            # 각 페이지 크롤링
-            result = crawl_web_page(url, extract_text=extract_text, extract_links=False)
-            
-            try:
-                # JSON 파싱 시도
-                result_dict = json.loads(result)
-                results.append(result_dict)
-            except:
-                # JSON이 아니면 텍스트로 추가
-                results.append({"url": url, "error": result})
-            
-            # 요청 간 딜레이 (서버 부하 방지)
-            if i < len(url_list):
-                time.sleep(1)
+        url_list = list(dict.fromkeys(url_list))[:10]  # 중복 제거 후 최대 10개 URL
+        
+        # 호스트별로 묶어서 호스트 간에는 병렬, 같은 호스트 안에서는 순차로 크롤링
+        host_groups: Dict[str, List[Tuple[int, str]]] = {}
+        for i, url in enumerate(url_list):
+            host_groups.setdefault(urlparse(url).netloc, []).append((i, url))
+        
+        def crawl_host_group(group: List[Tuple[int, str]]) -> List[Tuple[int, Dict[str, Any]]]:
+            group_results = []
+            for i, url in group:
+                # 같은 호스트 요청 간 간격은 _fetch_html에서 호스트별로 조절
+                logger.info(f"크롤링 중 ({i + 1}/{len(url_list)}): {url}")
+                
+                # 각 페이지 크롤링 (실패 시 {"url", "error"} dict)
+                group_results.append((i, _crawl_impl(url, extract_text=extract_text, extract_links=False)))
+            return group_results
         
-        return json.dumps({
+        results: List[Optional[Dict[str, Any]]] = [None] * len(url_list)
+        with ThreadPoolExecutor(max_workers=min(MAX_CRAWL_WORKERS, len(host_groups))) as executor:
+            for group_results in executor.map(crawl_host_group, host_groups.values()):
+                for i, result_dict in group_results:
+                    results[i] = result_dict
+        
+        return _dumps_json({
             "total": len(results),
             "results": results
-        }, ensure_ascii=False, indent=2)
+        })
         
     except Exception as e:
         logger.error(f"여러 페이지 크롤링 중 오류 발생: {str(e)}")
         return f"❌ 오류 발생: {str(e)}"
 
 
+@lru_cache(maxsize=128)
+def _compile_selector(selector: str) -> CSSSelector:
+    """CSS 선택자를 XPath로 변환·컴파일 (같은 선택자 반복 사용 시 재파싱 생략)"""
+    return CSSSelector(selector, translator='html')
+
+
 @tool("특정 요소 크롤링 도구")
 def crawl_specific_elements(url: str, selector: str) -> str:
     """
@@ -172,15 +378,14 @@ def crawl_specific_elements(url: str, selector: str) -> str:
         if not parsed.scheme or not parsed.netloc:
             return f"❌ 잘못된 URL 형식: {url}"
         
-        # HTTP 요청
-        response = requests.get(url, headers=DEFAULT_HEADERS, timeout=10)
-        response.raise_for_status()
+        # HTTP 요청 (본문 크기 제한)
+        response, body = _fetch_html(url)
         
-        # HTML 파싱
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # HTML 파싱 (BeautifulSoup 없이 lxml 트리에서 직접 CSS 선택)
+        tree = _parse_lxml(body, response.headers.get("Content-Type", ""))
         
         # 선택자로 요소 찾기
-        elements = soup.select(selector)
+        elements = _compile_selector(selector)(tree)
         
         if not elements:
             return json.dumps({
@@ -193,17 +398,17 @@ def crawl_specific_elements(url: str, selector: str) -> str:
         results = []
         for elem in elements[:20]:  # 최대 20개 요소
             results.append({
-                "tag": elem.name,
-                "text": elem.get_text(strip=True),
-                "html": str(elem)[:500]  # 최대 500자
+                "tag": elem.tag,
+                "text": "".join(text.strip() for text in elem.itertext()),
+                "html": lxml.html.tostring(elem, encoding='unicode', with_tail=False)[:500]  # 최대 500자
             })
         
-        return json.dumps({
+        return _dumps_json({
             "url": url,
             "selector": selector,
             "found": len(elements),
             "elements": results
-        }, ensure_ascii=False, indent=2)
+        })
         
     except requests.exceptions.RequestException as e:
         logger.error(f"웹 크롤링 요청 실패: {str(e)}")
@@ -5,11 +5,17 @@ Web Search Tool
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from typing import List, Dict, Any, Optional
 import os
 from datetime import datetime
 
 
+# 법령 API 호출 간 공유하는 HTTP 세션 (Keep-Alive 연결 재사용)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=50))
+
+
 class WebSearchTool:
     """
     웹 검색 도구
@@ -178,7 +184,7 @@ class LawDatabaseSearchTool:
                 "query": query or law_name
             }
 
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = _SESSION.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
 
             # XML 파싱 및 데이터 추출 (실제 구현 필요)
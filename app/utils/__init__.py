@@ -3,13 +3,23 @@ Utility Functions
 """
 
 from .document_parser import parse_document
-from .agent_loader import (
-    AgentConfigLoader,
-    get_agent_loader,
-    load_agent,
-    load_all_agents
+
+# agent_loader는 crewai/langchain을 임포트하므로 처음 접근할 때 로드 (PEP 562)
+_LAZY_AGENT_LOADER_NAMES = (
+    "AgentConfigLoader",
+    "get_agent_loader",
+    "load_agent",
+    "load_all_agents"
 )
 
+
+def __getattr__(name):
+    if name in _LAZY_AGENT_LOADER_NAMES:
+        from . import agent_loader
+        return getattr(agent_loader, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "parse_document",
     "AgentConfigLoader",
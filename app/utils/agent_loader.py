@@ -5,12 +5,44 @@ agent.yaml 파일을 읽어서 CrewAI Agent 객체를 생성합니다.
 """
 
 import yaml
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List
-from crewai import Agent
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, TYPE_CHECKING
 import os
 
+# crewai/langchain은 임포트 비용이 커서 실제로 Agent/LLM을 만들 때만 로드
+if TYPE_CHECKING:
+    from crewai import Agent
+
+# libyaml C 바인딩이 있으면 사용 (순수 Python SafeLoader보다 수 배 빠름)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# agent.yaml에 max_iter가 없거나 null일 때 사용하는 기본값
+_DEFAULT_MAX_ITER = 3
+
+
+@lru_cache(maxsize=4)
+def _load_yaml_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    YAML 파일 파싱 결과 캐시 (로더 인스턴스 간 공유)
+
+    mtime을 키에 포함하므로 파일이 수정되면 다시 파싱합니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+
+@dataclass(frozen=True, slots=True)
+class AgentSpec:
+    """agent.yaml의 Agent 설정 (로드 시 한 번 정리해 둔 값)"""
+    role: str  # 공백 제거된 역할
+    goal: str  # 공백 제거된 목표
+    backstory: str  # 공백 제거된 배경
+    verbose: bool = True
+    allow_delegation: bool = False
+    max_iter: int = _DEFAULT_MAX_ITER
+
 
 class AgentConfigLoader:
     """Agent 설정을 YAML에서 로드하는 클래스"""
@@ -26,20 +58,41 @@ class AgentConfigLoader:
 
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self._agent_specs = self._build_agent_specs(self.config)
         # LLM은 Agent별로 동적으로 생성하므로 여기서는 생성하지 않음
 
     def _load_config(self) -> Dict[str, Any]:
         """YAML 파일 로드"""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"Agent config file not found: {self.config_path}")
+        try:
+            mtime = self.config_path.stat().st_mtime
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Agent config file not found: {self.config_path}") from None
 
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+        return _load_yaml_cached(str(self.config_path), mtime)
+
+    @staticmethod
+    def _build_agent_specs(config: Dict[str, Any]) -> Dict[str, AgentSpec]:
+        """role이 있는 최상위 항목을 AgentSpec으로 변환 (tools/crew 등은 제외)"""
+        return {
+            name: AgentSpec(
+                role=agent_config.get("role", "").strip(),
+                goal=agent_config.get("goal", "").strip(),
+                backstory=agent_config.get("backstory", "").strip(),
+                verbose=bool(agent_config.get("verbose", True)),
+                allow_delegation=bool(agent_config.get("allow_delegation", False)),
+                max_iter=_DEFAULT_MAX_ITER if agent_config.get("max_iter") is None else int(agent_config["max_iter"])
+            )
+            for name, agent_config in config.items()
+            if isinstance(agent_config, dict) and "role" in agent_config
+        }
 
     def _get_llm(self, agent_name: str = None):
         """
         Agent별 LLM 인스턴스 생성
         
+        Agent를 만들 때마다 새로 생성 (CrewAI가 Agent 생성 시 llm.callbacks에
+        토큰 집계 핸들러를 추가하므로 인스턴스를 공유하면 핸들러가 계속 누적됨)
+        
         멀티 에이전트 아키텍처:
         - Claude (Anthropic): Extractor, Generator (해석/생성)
         - OpenAI: Classifier, Validator (검증/감사)
@@ -48,7 +101,6 @@ class AgentConfigLoader:
             agent_name: agent 이름 (extractor, classifier, generator, validator)
         """
         from app.config import get_settings
-        from langchain_anthropic import ChatAnthropic
         settings = get_settings()
         
         # Claude를 사용하는 Agent들
@@ -58,21 +110,38 @@ class AgentConfigLoader:
         openai_agents = ["classifier", "validator"]
         
         if agent_name in claude_agents:
-            # Claude 사용 (Extractor, Generator)
             if not settings.anthropic_api_key:
                 print(f"⚠️ ANTHROPIC_API_KEY가 설정되지 않아 OpenAI를 사용합니다.")
-                return ChatOpenAI(
-                    model=os.getenv("OPENAI_MODEL", settings.openai_model),
-                    openai_api_key=settings.openai_api_key,
-                    temperature=0.3
-                )
+                llm_key = "openai"
+            else:
+                llm_key = "claude"
+        elif agent_name == "validator":
+            llm_key = "validator"
+        else:
+            llm_key = "openai"
+        
+        return self._create_llm(llm_key, settings)
+
+    def _create_llm(self, llm_key: str, settings):
+        """
+        LLM 인스턴스 생성
+
+        Args:
+            llm_key: "claude" (Extractor/Generator), "validator", "openai" (Classifier 등)
+            settings: 애플리케이션 설정
+        """
+        from langchain_openai import ChatOpenAI
+
+        if llm_key == "claude":
+            # Claude 사용 (Extractor, Generator)
+            from langchain_anthropic import ChatAnthropic
             return ChatAnthropic(
                 model=os.getenv("ANTHROPIC_MODEL", settings.anthropic_model),
                 anthropic_api_key=settings.anthropic_api_key,
                 temperature=0.3,
                 max_tokens=8192  # 긴 문서 생성 시 충분한 토큰 할당
             )
-        elif agent_name == "validator":
+        elif llm_key == "validator":
             # Validator는 별도 OpenAI 모델 사용 가능
             validator_model = os.getenv("OPENAI_MODEL_VALIDATOR", getattr(settings, 'openai_model_validator', settings.openai_model))
             return ChatOpenAI(
@@ -81,14 +150,14 @@ class AgentConfigLoader:
                 temperature=0.1  # Validator는 더 낮은 temperature
             )
         else:
-            # OpenAI 사용 (Classifier 등)
+            # OpenAI 사용 (Classifier, Claude 키가 없을 때의 Extractor/Generator)
             return ChatOpenAI(
                 model=os.getenv("OPENAI_MODEL", settings.openai_model),
                 openai_api_key=settings.openai_api_key,
                 temperature=0.3
             )
 
-    def create_agent(self, agent_name: str) -> Agent:
+    def create_agent(self, agent_name: str) -> "Agent":
         """
         YAML 설정으로 Agent 생성
 
@@ -98,10 +167,11 @@ class AgentConfigLoader:
         Returns:
             CrewAI Agent 객체
         """
-        if agent_name not in self.config:
-            raise ValueError(f"Agent '{agent_name}' not found in config")
+        from crewai import Agent
 
-        agent_config = self.config[agent_name]
+        spec = self._agent_specs.get(agent_name)
+        if spec is None:
+            raise ValueError(f"Agent '{agent_name}' not found in config")
         
         # Agent별 Tool 로드
         tools = self._get_agent_tools(agent_name)
@@ -110,13 +180,13 @@ class AgentConfigLoader:
         agent_llm = self._get_llm(agent_name)
 
         return Agent(
-            role=agent_config.get("role", "").strip(),
-            goal=agent_config.get("goal", "").strip(),
-            backstory=agent_config.get("backstory", "").strip(),
+            role=spec.role,
+            goal=spec.goal,
+            backstory=spec.backstory,
             llm=agent_llm,  # Agent별로 다른 LLM 사용
-            verbose=agent_config.get("verbose", True),
-            allow_delegation=agent_config.get("allow_delegation", False),
-            max_iter=agent_config.get("max_iter", 3),
+            verbose=spec.verbose,
+            allow_delegation=spec.allow_delegation,
+            max_iter=spec.max_iter,
             tools=tools
         )
     
@@ -147,7 +217,7 @@ class AgentConfigLoader:
         else:
             return []  # extractor는 기본적으로 tool 없음
 
-    def get_all_agents(self) -> Dict[str, Agent]:
+    def get_all_agents(self) -> Dict[str, "Agent"]:
         """
         모든 Agent를 생성하여 딕셔너리로 반환
 
@@ -158,7 +228,7 @@ class AgentConfigLoader:
         return {
             name: self.create_agent(name)
             for name in agent_names
-            if name in self.config
+            if name in self._agent_specs
         }
 
     def get_tools_config(self) -> Dict[str, Any]:
@@ -192,7 +262,7 @@ def get_agent_loader() -> AgentConfigLoader:
 
 
 # 편의 함수들
-def load_agent(agent_name: str) -> Agent:
+def load_agent(agent_name: str) -> "Agent":
     """
     YAML 설정에서 특정 Agent 로드
 
@@ -206,7 +276,7 @@ def load_agent(agent_name: str) -> Agent:
     return loader.create_agent(agent_name)
 
 
-def load_all_agents() -> Dict[str, Agent]:
+def load_all_agents() -> Dict[str, "Agent"]:
     """
     YAML 설정에서 모든 Agent 로드
 
@@ -5,12 +5,21 @@
 Claude를 사용하여 마크다운을 PDF/DOCX에 최적화된 형식으로 변환
 """
 
-from typing import Optional
+from typing import List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import asyncio
+import atexit
+import hashlib
+import html
 import io
 import re
 import os
+import shutil
 import tempfile
 import subprocess
+import threading
 import logging
 from pathlib import Path
 from app.config import get_settings
@@ -19,13 +28,14 @@ logger = logging.getLogger(__name__)
 
 try:
     import markdown
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
 except ImportError:
     markdown = None
-    HTML = None
-    CSS = None
-    FontConfiguration = None
+
+# weasyprint/htmldocx는 import 비용이 커서(cffi·pydyf·fontTools, BeautifulSoup 등) 처음 필요할 때 로드
+HTML = None
+CSS = None
+FontConfiguration = None
+_weasyprint_loaded = False
 
 try:
     from docx import Document
@@ -34,10 +44,239 @@ try:
 except ImportError:
     Document = None
 
-try:
-    from htmldocx import HtmlToDocx
-except ImportError:
-    HtmlToDocx = None
+HtmlToDocx = None
+_htmldocx_loaded = False
+
+
+def _load_weasyprint() -> bool:
+    """weasyprint 지연 로드 (최초 호출 시 한 번만 import, 설치되지 않았으면 False)"""
+    global HTML, CSS, FontConfiguration, _weasyprint_loaded
+    if not _weasyprint_loaded:
+        try:
+            from weasyprint import HTML, CSS
+            from weasyprint.text.fonts import FontConfiguration
+        except ImportError:
+            pass
+        _weasyprint_loaded = True
+    return HTML is not None
+
+
+def _load_htmldocx() -> bool:
+    """htmldocx 지연 로드 (최초 호출 시 한 번만 import, 설치되지 않았으면 False)"""
+    global HtmlToDocx, _htmldocx_loaded
+    if not _htmldocx_loaded:
+        try:
+            from htmldocx import HtmlToDocx
+        except ImportError:
+            pass
+        _htmldocx_loaded = True
+    return HtmlToDocx is not None
+
+
+# markdown_to_docx 남은 플레이스홀더 제거용 정규식
+_PLACEHOLDER_RE = re.compile(r'\{[^}]+\}')
+
+# _is_html 판별용 태그 (대소문자 무시)
+_HEAD_TAG_RE = re.compile(r'<head>', re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r'<body>', re.IGNORECASE)
+
+# 여는 <html> 태그 (lang 등 속성 포함, 대소문자 무시)
+_HTML_OPEN_TAG_RE = re.compile(r'<html\b[^>]*>', re.IGNORECASE)
+
+# html_to_pdf에서 재배치할 charset 메타 태그
+_CHARSET_META_RE = re.compile(r'<meta\s+charset=["\']?UTF-8["\']?\s*/?>', re.IGNORECASE)
+
+# html_to_pdf charset 선언 여부 확인 (문서 전체를 lower()로 복사하지 않고 대소문자 무시 검색)
+_CHARSET_DECL_RE = re.compile(r'<meta charset|charset=', re.IGNORECASE)
+
+# mark_modified_text_in_html에서 건너뛸 HTML 마크업
+# (script/style 블록, 태그를 텍스트로 표시하는 title/textarea 블록, 주석, 태그)
+_HTML_MARKUP_PATTERN = (
+    r'<script\b.*?</script\s*>|<style\b.*?</style\s*>'
+    r'|<title\b.*?</title\s*>|<textarea\b.*?</textarea\s*>'
+    r'|<!--.*?-->|<[^>]*>'
+)
+
+# 마크다운 제목 기호 → DOCX 제목 수준
+_HEADING_LEVELS = {'#': 1, '##': 2, '###': 3}
+
+# markdown_to_pdf 공공문서 스타일 (CSS는 최초 변환 시 한 번만 파싱)
+_PDF_CSS = """
+@page {
+    size: A4;
+    margin: 2cm;
+}
+body {
+    font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #000;
+}
+h1 {
+    font-size: 18pt;
+    font-weight: bold;
+    margin-top: 20pt;
+    margin-bottom: 10pt;
+    text-align: center;
+}
+h2 {
+    font-size: 14pt;
+    font-weight: bold;
+    margin-top: 15pt;
+    margin-bottom: 8pt;
+    border-bottom: 1px solid #ccc;
+    padding-bottom: 3pt;
+}
+h3 {
+    font-size: 12pt;
+    font-weight: bold;
+    margin-top: 10pt;
+    margin-bottom: 5pt;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin: 10pt 0;
+}
+th, td {
+    border: 1px solid #000;
+    padding: 5pt;
+    text-align: left;
+}
+th {
+    background-color: #f0f0f0;
+    font-weight: bold;
+}
+p {
+    margin: 5pt 0;
+}
+strong {
+    font-weight: bold;
+}
+"""
+
+_PDF_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body>
+"""
+
+_PDF_HTML_TAIL = """
+</body>
+</html>
+"""
+
+# html_to_pdf·Anthropic 결과에서 HTML body만 전달받았을 때 적용하는 스타일 (수정/추출 텍스트 파란색 포함)
+_HTML_PDF_CSS = """
+@page {
+    size: A4;
+    margin: 2cm;
+}
+body {
+    font-family: "맑은 고딕", "Malgun Gothic", "Nanum Gothic", sans-serif;
+    font-size: 11pt;
+    line-height: 1.6;
+    color: #000;
+}
+.modified, .extracted {
+    color: #0066CC;
+}
+"""
+
+# WeasyPrint 폰트 설정/스타일시트 (fontconfig 초기화 비용이 커서 변환 간 재사용)
+_font_config = None
+_font_face_stylesheets = None
+_font_config_lock = threading.Lock()
+
+# WeasyPrint 렌더링 직렬화 (공유 FontConfiguration·스타일시트는 동시 사용에 안전하다는 보장이 없음)
+_pdf_render_lock = threading.Lock()
+
+# 문서 기본 글꼴("맑은 고딕")로 쓸 폰트 파일 (예: /usr/share/fonts/truetype/nanum/NanumGothic.ttf)
+# 지정 시 @font-face로 직접 등록해 렌더링마다 fontconfig에서 글꼴을 찾지 않음
+_PDF_FONT_PATH = os.getenv("PDF_FONT_PATH")
+
+
+def _get_font_config():
+    """공유 FontConfiguration 반환 (최초 호출 시 생성)"""
+    global _font_config
+    if _font_config is None:
+        # 병렬 변환 시 FontConfiguration이 중복 생성되지 않도록 잠금
+        with _font_config_lock:
+            if _font_config is None:
+                _font_config = FontConfiguration()
+    return _font_config
+
+
+def _get_font_face_stylesheets() -> list:
+    """PDF_FONT_PATH 폰트를 "맑은 고딕"/"Malgun Gothic"으로 등록하는 스타일시트 목록 반환 (미설정 시 빈 목록)"""
+    global _font_face_stylesheets
+    if _font_face_stylesheets is None:
+        if _PDF_FONT_PATH and os.path.isfile(_PDF_FONT_PATH):
+            font_url = Path(_PDF_FONT_PATH).resolve().as_uri()
+            font_face_css = "".join(
+                f'@font-face {{ font-family: "{family}"; src: url("{font_url}"); }}\n'
+                for family in ("맑은 고딕", "Malgun Gothic")
+            )
+            _font_face_stylesheets = [CSS(string=font_face_css, font_config=_get_font_config())]
+        else:
+            _font_face_stylesheets = []
+    return _font_face_stylesheets
+
+
+@lru_cache(maxsize=None)
+def _get_stylesheet(css_text: str):
+    """CSS 문자열별 파싱된 스타일시트 반환 (모듈 상수 CSS만 전달하므로 최초 1회만 파싱)"""
+    return CSS(string=css_text, font_config=_get_font_config())
+
+
+# 마크다운 변환기 (확장 로딩/정규식 컴파일 비용을 줄이기 위해 스레드별로 재사용, 인스턴스는 스레드 안전하지 않음)
+_markdown_local = threading.local()
+
+
+def _render_markdown(markdown_content: str) -> str:
+    """마크다운을 HTML로 변환 (tables, fenced_code 확장)"""
+    md = getattr(_markdown_local, "md", None)
+    if md is None:
+        md = _markdown_local.md = markdown.Markdown(extensions=['tables', 'fenced_code'])
+    return md.reset().convert(markdown_content)
+
+
+def _write_pdf(html_doc, output_path: Optional[str], css_text: Optional[str] = None, **kwargs) -> bytes:
+    """
+    WeasyPrint PDF 렌더링 (output_path가 있으면 렌더링 결과를 파일에도 저장)
+    
+    모든 렌더링에 공유 FontConfiguration과 기본 글꼴 @font-face 스타일시트를 적용하고,
+    css_text가 있으면 해당 CSS의 캐시된 스타일시트도 적용.
+    스타일시트 생성과 렌더링은 _pdf_render_lock 안에서 한 번에 하나씩 수행
+    """
+    with _pdf_render_lock:
+        stylesheets = _get_font_face_stylesheets()
+        if css_text is not None:
+            stylesheets = stylesheets + [_get_stylesheet(css_text)]
+        if stylesheets:
+            kwargs["stylesheets"] = stylesheets
+        kwargs.setdefault("font_config", _get_font_config())
+        
+        pdf_bytes = html_doc.write_pdf(**kwargs)
+    if output_path:
+        Path(output_path).write_bytes(pdf_bytes)
+    return pdf_bytes
+
+
+def _render_pdf_body(body_html: str, css_text: str, output_path: Optional[str], **kwargs) -> bytes:
+    """
+    HTML body를 공용 문서 머리/꼬리로 감싸 PDF로 렌더링
+    
+    스타일은 <style> 태그 대신 미리 파싱해 둔 스타일시트로 적용 (문서마다 CSS를 다시 파싱하지 않음)
+    """
+    return _write_pdf(
+        HTML(string=_PDF_HTML_HEAD + body_html + _PDF_HTML_TAIL),
+        output_path,
+        css_text=css_text,
+        **kwargs
+    )
 
 
 def markdown_to_pdf(markdown_content: str, output_path: Optional[str] = None) -> bytes:
@@ -51,94 +290,61 @@ def markdown_to_pdf(markdown_content: str, output_path: Optional[str] = None) ->
     Returns:
         PDF 파일 바이트 (output_path가 None인 경우)
     """
-    if HTML is None:
+    if markdown is None or not _load_weasyprint():
         raise ImportError(
             "PDF 변환을 위해 다음 패키지가 필요합니다: "
             "pip install markdown weasyprint"
         )
 
     # 마크다운을 HTML로 변환
-    html_content = markdown.markdown(
-        markdown_content,
-        extensions=['tables', 'fenced_code']
-    )
+    html_content = _render_markdown(markdown_content)
+
+    # HTML을 PDF로 변환 (공공문서 스타일 적용)
+    return _render_pdf_body(html_content, _PDF_CSS, output_path)
+
+
+def _add_text_paragraph(add_paragraph, line: str) -> None:
+    """일반 문단 추가 (인라인 마크다운 처리: **볼드**는 굵은 글씨 run으로, 남은 플레이스홀더는 제거)"""
+    # **볼드** 구간을 한 번 훑으며 (텍스트, 볼드 여부) 조각으로 분리
+    segments = []
+    pos = 0
+    while True:
+        start = line.find('**', pos)
+        end = line.find('**', start + 3) if start != -1 else -1
+        if end == -1:
+            segments.append((line[pos:], False))
+            break
+        segments.append((line[pos:start], False))
+        segments.append((line[start + 2:end], True))
+        pos = end + 2
+
+    # {플레이스홀더} 제거 (혹시 남아있을 경우)
+    segments = [(_PLACEHOLDER_RE.sub('', text), bold) for text, bold in segments]
+
+    if not any(text.strip() for text, _ in segments):
+        return
+
+    p = add_paragraph()
+    for text, bold in segments:
+        if text:
+            run = p.add_run(text)
+            if bold:
+                run.bold = True
 
-    # HTML 스타일 추가 (공공문서 스타일)
-    styled_html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <style>
-            @page {{
-                size: A4;
-                margin: 2cm;
-            }}
-            body {{
-                font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
-                font-size: 11pt;
-                line-height: 1.6;
-                color: #000;
-            }}
-            h1 {{
-                font-size: 18pt;
-                font-weight: bold;
-                margin-top: 20pt;
-                margin-bottom: 10pt;
-                text-align: center;
-            }}
-            h2 {{
-                font-size: 14pt;
-                font-weight: bold;
-                margin-top: 15pt;
-                margin-bottom: 8pt;
-                border-bottom: 1px solid #ccc;
-                padding-bottom: 3pt;
-            }}
-            h3 {{
-                font-size: 12pt;
-                font-weight: bold;
-                margin-top: 10pt;
-                margin-bottom: 5pt;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin: 10pt 0;
-            }}
-            th, td {{
-                border: 1px solid #000;
-                padding: 5pt;
-                text-align: left;
-            }}
-            th {{
-                background-color: #f0f0f0;
-                font-weight: bold;
-            }}
-            p {{
-                margin: 5pt 0;
-            }}
-            strong {{
-                font-weight: bold;
-            }}
-        </style>
-    </head>
-    <body>
-        {html_content}
-    </body>
-    </html>
-    """
 
-    # HTML을 PDF로 변환
-    font_config = FontConfiguration()
-    pdf_bytes = HTML(string=styled_html).write_pdf(font_config=font_config)
+def _add_table(doc, table_data: List[List[str]]) -> None:
+    """마크다운 테이블 행 목록을 DOCX 테이블로 추가 (첫 번째 행은 헤더)"""
+    table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
+    table.style = 'Light Grid Accent 1'
 
-    if output_path:
-        with open(output_path, 'wb') as f:
-            f.write(pdf_bytes)
-        return pdf_bytes
-    else:
-        return pdf_bytes
+    # 행/셀 목록은 조회할 때마다 XML을 다시 훑으므로 행마다 한 번만 가져옴
+    # 새 셀에는 빈 문단이 하나 있으므로 cell.text로 내용을 지우고 다시 만들지 않고 run만 추가
+    for row_idx, (row, row_data) in enumerate(zip(table.rows, table_data)):
+        for cell, cell_data in zip(row.cells, row_data):
+            run = cell.paragraphs[0].add_run(cell_data)
+            # 첫 번째 행은 헤더로 스타일링
+            if row_idx == 0:
+                run.bold = True
 
 
 def markdown_to_docx(markdown_content: str, output_path: Optional[str] = None) -> bytes:
@@ -161,78 +367,62 @@ def markdown_to_docx(markdown_content: str, output_path: Optional[str] = None) -
     # DOCX 문서 생성
     doc = Document()
 
+    # 루프 안에서 반복되는 속성 조회 생략
+    add_heading = doc.add_heading
+    add_paragraph = doc.add_paragraph
+
     # 마크다운 파싱 (간단한 구현)
-    lines = markdown_content.split('\n')
-    i = 0
+    # 줄 목록을 따로 만들지 않고 한 줄씩 읽으며, 연속된 테이블 행은 모아 두었다가
+    # 테이블이 아닌 줄(또는 문서 끝)을 만나면 한 번에 테이블로 추가
+    table_data = []
+    for raw_line in io.StringIO(markdown_content):
+        line = raw_line.strip()
+
+        if line.startswith('|'):
+            # 테이블 행
+            row = [cell.strip() for cell in line.split('|')[1:-1]]
+            if row and not all(cell.startswith('-') for cell in row):  # 헤더 구분선 제외
+                table_data.append(row)
+            continue
 
-    while i < len(lines):
-        line = lines[i].strip()
+        if table_data:
+            _add_table(doc, table_data)
+            table_data = []
 
         if not line:
-            i += 1
             continue
 
-        # 제목 처리
-        if line.startswith('# '):
-            # H1
-            heading = doc.add_heading(line[2:], level=1)
-            heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        elif line.startswith('## '):
-            # H2
-            doc.add_heading(line[3:], level=2)
-        elif line.startswith('### '):
-            # H3
-            doc.add_heading(line[4:], level=3)
-        elif line.startswith('---'):
+        # 블록 종류는 첫 글자로 먼저 구분 (줄마다 startswith를 여러 번 호출하지 않도록)
+        first = line[0]
+
+        if first == '#':
+            # 제목 처리 (H1~H3, 그 외는 일반 문단)
+            marker, sep, title = line.partition(' ')
+            level = _HEADING_LEVELS.get(marker) if sep else None
+            if level == 1:
+                heading = add_heading(title, level=1)
+                heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            elif level:
+                add_heading(title, level=level)
+            else:
+                _add_text_paragraph(add_paragraph, line)
+        elif first == '-' and line.startswith('---'):
             # 구분선 (빈 줄로 대체)
-            doc.add_paragraph('')
-        elif line.startswith('|'):
-            # 테이블 처리
-            table_data = []
-            while i < len(lines) and lines[i].strip().startswith('|'):
-                row = [cell.strip() for cell in lines[i].split('|')[1:-1]]
-                if row and not all(cell.startswith('-') for cell in row):  # 헤더 구분선 제외
-                    table_data.append(row)
-                i += 1
-            i -= 1  # 다음 반복에서 현재 줄 다시 처리
-
-            if table_data:
-                table = doc.add_table(rows=len(table_data), cols=len(table_data[0]))
-                table.style = 'Light Grid Accent 1'
-
-                for row_idx, row_data in enumerate(table_data):
-                    for col_idx, cell_data in enumerate(row_data):
-                        cell = table.rows[row_idx].cells[col_idx]
-                        cell.text = cell_data
-                        # 첫 번째 행은 헤더로 스타일링
-                        if row_idx == 0:
-                            for paragraph in cell.paragraphs:
-                                for run in paragraph.runs:
-                                    run.bold = True
-
-        elif line.startswith('- ') or line.startswith('* '):
+            add_paragraph('')
+        elif first in '-*' and line[1:2] == ' ':
             # 리스트 항목
-            list_text = line[2:]
-            doc.add_paragraph(list_text, style='List Bullet')
-        elif line.startswith('**') and line.endswith('**'):
+            add_paragraph(line[2:], style='List Bullet')
+        elif first == '*' and line.startswith('**') and line.endswith('**'):
             # 볼드 텍스트
-            text = line[2:-2]
-            p = doc.add_paragraph()
-            run = p.add_run(text)
+            p = add_paragraph()
+            run = p.add_run(line[2:-2])
             run.bold = True
         else:
-            # 일반 문단
-            # 인라인 마크다운 처리 (간단한 구현)
-            text = line
-            # **볼드** 처리
-            text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # 볼드 제거 (일단)
-            # {플레이스홀더} 제거 (혹시 남아있을 경우)
-            text = re.sub(r'\{[^}]+\}', '', text)
-            
-            if text.strip():
-                doc.add_paragraph(text)
+            _add_text_paragraph(add_paragraph, line)
 
-        i += 1
+    # 문서 끝에 있는 테이블
+    if table_data:
+        _add_table(doc, table_data)
 
     # 문서 스타일 설정
     style = doc.styles['Normal']
@@ -240,18 +430,43 @@ def markdown_to_docx(markdown_content: str, output_path: Optional[str] = None) -
     font.name = '맑은 고딕'
     font.size = Pt(11)
 
-    # 바이트로 변환
+    # 바이트로 변환 (output_path가 있으면 같은 바이트를 파일에도 저장)
     doc_bytes = io.BytesIO()
     doc.save(doc_bytes)
-    doc_bytes.seek(0)
-    result_bytes = doc_bytes.read()
-
+    docx_content = doc_bytes.getvalue()
     if output_path:
-        with open(output_path, 'wb') as f:
-            f.write(result_bytes)
-        return result_bytes
-    else:
-        return result_bytes
+        Path(output_path).write_bytes(docx_content)
+    return docx_content
+
+
+# Anthropic 변환 결과 캐시 (키: 마크다운 sha256, 출력 형식, 모델명)
+_ANTHROPIC_CACHE_SIZE = 128
+_anthropic_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_anthropic_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_anthropic_setup() -> Optional[tuple]:
+    """
+    공유 Anthropic 클라이언트와 모델명 반환 (최초 호출 시 한 번만 결정)
+    
+    API 키가 없거나 anthropic 패키지가 없으면 None을 캐시해 이후 호출은 바로 건너뜀
+    (클라이언트는 HTTP 연결 풀 재사용을 위해 호출 간 공유)
+    """
+    settings = get_settings()
+    if not settings.anthropic_api_key:
+        logger.warning("⚠️ ANTHROPIC_API_KEY가 설정되지 않았습니다. 기존 라이브러리 사용")
+        return None
+    
+    try:
+        import anthropic
+    except ImportError:
+        logger.warning("⚠️ anthropic 패키지가 설치되지 않았습니다. 기존 라이브러리 사용")
+        return None
+    
+    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    model_name = os.getenv("ANTHROPIC_MODEL", settings.anthropic_model)
+    return client, model_name
 
 
 def convert_markdown_with_anthropic(
@@ -268,16 +483,24 @@ def convert_markdown_with_anthropic(
     Returns:
         변환된 HTML 또는 구조화된 텍스트
     """
+    anthropic_setup = _get_anthropic_setup()
+    if anthropic_setup is None:
+        return None
+    client, model_name = anthropic_setup
+    
     try:
-        import anthropic
-        settings = get_settings()
-        
-        if not settings.anthropic_api_key:
-            print(f"⚠️ ANTHROPIC_API_KEY가 설정되지 않았습니다. 기존 라이브러리 사용")
-            return None
-        
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        model_name = os.getenv("ANTHROPIC_MODEL", settings.anthropic_model)
+        # 같은 내용·형식·모델의 변환 결과가 있으면 API 호출 생략
+        cache_key = (
+            hashlib.sha256(markdown_content.encode("utf-8")).hexdigest(),
+            output_format.lower(),
+            model_name
+        )
+        with _anthropic_cache_lock:
+            cached = _anthropic_cache.get(cache_key)
+            if cached is not None:
+                _anthropic_cache.move_to_end(cache_key)
+                logger.info(f"✅ Anthropic {output_format.upper()} 변환 캐시 사용 ({len(cached)}자)")
+                return cached
         
         format_instruction = {
             "pdf": "PDF 형식에 최적화된 완전한 HTML 문서로 변환하세요. <!DOCTYPE html><html><head><meta charset='UTF-8'><style>@page {size: A4; margin: 2cm;} body {font-family: '맑은 고딕', 'Malgun Gothic', sans-serif; font-size: 11pt; line-height: 1.6;}</style></head><body>...</body></html> 형식으로 완전한 HTML을 출력하세요.",
@@ -318,20 +541,34 @@ def convert_markdown_with_anthropic(
         if response.content and len(response.content) > 0:
             result_text = response.content[0].text
             if result_text and result_text.strip():
-                print(f"✅ Anthropic API로 {output_format.upper()} 변환 성공 ({len(result_text)}자)")
+                logger.info(f"✅ Anthropic API로 {output_format.upper()} 변환 성공 ({len(result_text)}자)")
+                with _anthropic_cache_lock:
+                    _anthropic_cache[cache_key] = result_text
+                    if len(_anthropic_cache) > _ANTHROPIC_CACHE_SIZE:
+                        _anthropic_cache.popitem(last=False)
                 return result_text
             else:
-                print(f"⚠️ Anthropic API 응답 텍스트가 비어있습니다. 기존 라이브러리 사용")
+                logger.warning("⚠️ Anthropic API 응답 텍스트가 비어있습니다. 기존 라이브러리 사용")
         else:
-            print(f"⚠️ Anthropic API 응답에 content가 없습니다. 기존 라이브러리 사용")
+            logger.warning("⚠️ Anthropic API 응답에 content가 없습니다. 기존 라이브러리 사용")
         
         return None
         
     except Exception as e:
-        print(f"⚠️ Anthropic API 변환 실패: {e}. 기존 라이브러리 사용")
+        logger.warning(f"⚠️ Anthropic API 변환 실패: {e}. 기존 라이브러리 사용")
         return None
 
 
+def _html_prefix(content: str) -> str:
+    """앞부분만 잘라 공백 제거·소문자 변환 (큰 문서 전체를 strip()/lower()로 복사하지 않음)"""
+    return content[:2048].lstrip()[:256].lower()
+
+
+def _is_full_html_document(html_content: str) -> bool:
+    """HTML이 <!DOCTYPE html> 또는 <html ...>로 시작하는 완전한 문서인지 확인 (대소문자 무시)"""
+    return _html_prefix(html_content).startswith(("<!doctype html", "<html"))
+
+
 def _is_html(content: str) -> bool:
     """
     내용이 HTML인지 마크다운인지 판단
@@ -342,13 +579,10 @@ def _is_html(content: str) -> bool:
     Returns:
         HTML이면 True, 마크다운이면 False
     """
-    content_stripped = content.strip()
-    return (
-        content_stripped.startswith("<!DOCTYPE html>") or
-        content_stripped.startswith("<html>") or
-        content_stripped.startswith("<HTML>") or
-        ("<body>" in content_stripped.lower() and "<head>" in content_stripped.lower())
-    )
+    if _is_full_html_document(content):
+        return True
+    # <head>/<body>는 문서 어디에나 있을 수 있으므로 대소문자 무시 검색으로 전체 확인
+    return bool(_HEAD_TAG_RE.search(content) and _BODY_TAG_RE.search(content))
 
 
 def convert_document(
@@ -390,47 +624,9 @@ def convert_document(
     anthropic_result = convert_markdown_with_anthropic(markdown_content, output_format)
     
     if anthropic_result and output_format.lower() == "pdf":
-        # Anthropic이 HTML을 반환했다면, 이를 PDF로 변환
-        if HTML is None:
-            raise ImportError("PDF 변환을 위해 weasyprint가 필요합니다: pip install weasyprint")
-        
-        # Anthropic이 이미 완전한 HTML을 반환했는지 확인
-        if anthropic_result.strip().startswith("<!DOCTYPE html>") or anthropic_result.strip().startswith("<html>"):
-            # 이미 완전한 HTML이면 그대로 사용
-            styled_html = anthropic_result
-        else:
-            # HTML body만 있으면 전체 HTML 구조로 감싸기
-            styled_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    @page {{
-                        size: A4;
-                        margin: 2cm;
-                    }}
-                    body {{
-                        font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
-                        font-size: 11pt;
-                        line-height: 1.6;
-                        color: #000;
-                    }}
-                </style>
-            </head>
-            <body>
-                {anthropic_result}
-            </body>
-            </html>
-            """
-        
-        font_config = FontConfiguration()
-        pdf_bytes = HTML(string=styled_html).write_pdf(font_config=font_config)
-        
-        if output_path:
-            with open(output_path, 'wb') as f:
-                f.write(pdf_bytes)
-        return pdf_bytes
+        # Anthropic이 HTML을 반환했다면 HTML → PDF 변환 경로를 그대로 사용
+        # (완전한 HTML 문서는 charset 정리 후, body만 있으면 공용 스타일시트로 렌더링)
+        return html_to_pdf(anthropic_result, output_path)
     
     elif anthropic_result and output_format.lower() == "docx":
         # Anthropic이 구조화된 텍스트를 반환했다면, 이를 DOCX로 변환
@@ -441,7 +637,7 @@ def convert_document(
         return markdown_to_docx(anthropic_result, output_path)
     
     # Anthropic 변환 실패 시 기존 라이브러리 사용
-    print("📝 Anthropic API 변환 실패 또는 미사용. 기존 라이브러리 사용")
+    logger.info("📝 Anthropic API 변환 실패 또는 미사용. 기존 라이브러리 사용")
     if output_format.lower() == "pdf":
         return markdown_to_pdf(markdown_content, output_path)
     elif output_format.lower() == "docx":
@@ -449,40 +645,56 @@ def convert_document(
     elif output_format.lower() == "hwp":
         # HWP 변환은 HTML을 통해서만 가능
         # 마크다운을 HTML로 변환 후 HWP로 변환
-        if HTML is None:
-            raise ImportError("HWP 변환을 위해 weasyprint가 필요합니다: pip install weasyprint")
+        if markdown is None:
+            raise ImportError("HWP 변환을 위해 markdown이 필요합니다: pip install markdown")
         
         # 마크다운을 HTML로 변환
-        html_content = markdown.markdown(
-            markdown_content,
-            extensions=['tables', 'fenced_code']
-        )
-        
-        # HTML 구조로 감싸기
-        full_html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.6;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
+        html_content = _render_markdown(markdown_content)
         
-        return html_to_hwp_with_libreoffice(full_html, output_path)
+        # 본문만 넘기면 LibreOffice 변환 시 같은 본문 스타일의 문서 머리/꼬리로 감싸서 저장
+        return html_to_hwp_with_libreoffice(html_content, output_path)
     else:
         raise ValueError(f"지원하지 않는 형식: {output_format}. 'pdf' 또는 'docx'를 사용하세요.")
 
 
+# 비동기 변환용 작업 스레드 풀 (기본 executor와 분리해 동시 변환 수를 제한, 최초 사용 시 생성)
+_CONVERT_WORKERS = max(1, int(os.getenv("DOCUMENT_CONVERT_WORKERS", "4")))
+_convert_executor = None
+_convert_executor_lock = threading.Lock()
+
+
+def _get_convert_executor() -> ThreadPoolExecutor:
+    """공유 변환 스레드 풀 반환 (최초 호출 시 생성)"""
+    global _convert_executor
+    if _convert_executor is None:
+        with _convert_executor_lock:
+            if _convert_executor is None:
+                _convert_executor = ThreadPoolExecutor(
+                    max_workers=_CONVERT_WORKERS,
+                    thread_name_prefix="document_convert"
+                )
+    return _convert_executor
+
+
+async def convert_document_async(
+    content: str,
+    output_format: str = "pdf",
+    output_path: Optional[str] = None,
+    is_html: Optional[bool] = None
+) -> bytes:
+    """
+    convert_document의 비동기 버전 (async 핸들러용)
+    
+    변환(WeasyPrint 렌더링, LibreOffice 프로세스 대기)을 변환 전용 스레드 풀에서 실행하므로
+    변환이 끝날 때까지 이벤트 루프가 막히지 않고 다른 요청을 계속 처리함
+    (동시 변환은 DOCUMENT_CONVERT_WORKERS개까지, WeasyPrint 렌더링은 한 번에 하나씩)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_convert_executor(), convert_document, content, output_format, output_path, is_html
+    )
+
+
 # 편의 함수
 def export_to_file(
     markdown_content: str,
@@ -505,13 +717,20 @@ def export_to_file(
     return str(output_path)
 
 
+@lru_cache(maxsize=1)
 def _find_libreoffice() -> Optional[str]:
     """
-    LibreOffice 실행 파일 경로 찾기
+    LibreOffice 실행 파일 경로 찾기 (최초 1회만 탐색)
+    
+    환경 변수 LIBREOFFICE_BIN이 있으면 파일 확인 없이 그대로 사용
     
     Returns:
         LibreOffice 실행 파일 경로 또는 None
     """
+    env_path = os.getenv("LIBREOFFICE_BIN")
+    if env_path:
+        return env_path
+    
     soffice_paths = [
         "/usr/bin/soffice",            # Linux (Docker)
         "/opt/homebrew/bin/soffice",  # macOS Homebrew
@@ -523,7 +742,8 @@ def _find_libreoffice() -> Optional[str]:
         if os.path.exists(path):
             return path
     
-    return None
+    # 알려진 위치에 없으면 PATH에서 탐색 (다른 배포판·설치 경로 대응)
+    return shutil.which("soffice") or shutil.which("libreoffice")
 
 
 def html_to_pdf(html_content: str, output_path: Optional[str] = None) -> bytes:
@@ -537,229 +757,71 @@ def html_to_pdf(html_content: str, output_path: Optional[str] = None) -> bytes:
     Returns:
         PDF 파일 바이트
     """
-    if HTML is None:
+    if not _load_weasyprint():
         raise ImportError("PDF 변환을 위해 weasyprint가 필요합니다: pip install weasyprint")
     
-    # HTML이 완전한 문서인지 확인
-    if not html_content.strip().startswith("<!DOCTYPE html>") and not html_content.strip().startswith("<html>"):
-        # HTML body만 있으면 전체 구조로 감싸기
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                @page {{
-                    size: A4;
-                    margin: 2cm;
-                }}
-                body {{
-                    font-family: "맑은 고딕", "Malgun Gothic", "Nanum Gothic", sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.6;
-                    color: #000;
-                }}
-                .modified, .extracted {{
-                    color: #0066CC;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
-    
-    # HTML에 charset이 명시되어 있는지 확인하고, 없으면 추가
-    html_lower = html_content.lower()
-    if '<meta charset' not in html_lower and '<meta http-equiv="content-type"' not in html_lower:
-        # head 태그 안에 charset 메타 태그 추가
-        if '<head>' in html_content:
-            html_content = html_content.replace('<head>', '<head>\n    <meta charset="UTF-8">', 1)
-        elif '<HEAD>' in html_content:
-            html_content = html_content.replace('<HEAD>', '<HEAD>\n    <meta charset="UTF-8">', 1)
-    
-    # WeasyPrint에 UTF-8로 전달하여 인코딩 문제 방지
-    font_config = FontConfiguration()
-    
-    # HTML에 charset이 확실히 있는지 확인하고 추가
-    html_lower = html_content.lower()
-    has_charset = '<meta charset' in html_lower or 'charset=' in html_lower
-    
-    if not has_charset:
-        # head 태그 바로 다음에 charset 추가
-        if '<head>' in html_content:
-            html_content = html_content.replace('<head>', '<head>\n    <meta charset="UTF-8">', 1)
-        elif '<HEAD>' in html_content:
-            html_content = html_content.replace('<HEAD>', '<HEAD>\n    <meta charset="UTF-8">', 1)
-        else:
-            # head 태그가 없으면 추가
-            if '<html>' in html_content:
-                html_content = html_content.replace('<html>', '<html>\n<head>\n    <meta charset="UTF-8">\n</head>', 1)
-            elif '<HTML>' in html_content:
-                html_content = html_content.replace('<HTML>', '<HTML>\n<HEAD>\n    <meta charset="UTF-8">\n</HEAD>', 1)
-    
-    # WeasyPrint에 UTF-8 바이트로 전달 (인코딩 문제 해결)
-    # HTML의 charset을 더 명확하게 지정 (HTML5 표준)
-    html_lower = html_content.lower()
-    if '<meta charset' not in html_lower:
-        # HTML5 방식: <meta charset="UTF-8">를 <head> 바로 다음에 추가
-        if '<head>' in html_content:
-            # <head> 다음에 charset 메타 태그 추가
-            head_pos = html_content.find('<head>')
-            if head_pos >= 0:
-                head_end = html_content.find('>', head_pos) + 1
-                html_content = html_content[:head_end] + '\n  <meta charset="UTF-8">' + html_content[head_end:]
-        elif '<HEAD>' in html_content:
-            head_pos = html_content.find('<HEAD>')
-            if head_pos >= 0:
-                head_end = html_content.find('>', head_pos) + 1
-                html_content = html_content[:head_end] + '\n  <meta charset="UTF-8">' + html_content[head_end:]
-    
-    # HTML을 UTF-8로 완전히 정규화 (인코딩 문제 해결)
-    # 한글 문자가 포함된 경우를 대비하여 UTF-8로 명시적으로 인코딩/디코딩
-    try:
-        # UTF-8로 인코딩 후 다시 디코딩하여 완전히 정규화
-        html_normalized = html_content.encode('utf-8', errors='strict').decode('utf-8', errors='strict')
-        logger.debug("HTML UTF-8 정규화 완료")
-    except Exception as norm_err:
-        logger.warning(f"HTML 정규화 실패, 원본 사용: {str(norm_err)}")
-        html_normalized = html_content
+    # HTML body만 있으면 charset 처리가 필요 없는 공용 머리/꼬리로 감싸 바로 렌더링
+    if not _is_full_html_document(html_content):
+        return _render_pdf_body(html_content, _HTML_PDF_CSS, output_path)
     
-    # HTML5 DOCTYPE이 없으면 추가 (WeasyPrint가 HTML5로 인식하도록)
-    if not html_normalized.strip().startswith('<!DOCTYPE'):
-        if html_normalized.strip().startswith('<html'):
-            html_normalized = '<!DOCTYPE html>\n' + html_normalized
-            logger.debug("HTML5 DOCTYPE 추가")
-    
-    # charset 메타 태그를 HTML5 방식으로 명확하게 지정 (WeasyPrint가 인식하도록)
-    # <head> 태그의 첫 번째 자식으로 charset 메타 태그를 배치
-    html_lower = html_normalized.lower()
-    has_charset_meta = '<meta charset' in html_lower or 'charset=' in html_lower
-    
-    if not has_charset_meta:
-        # HTML5 방식: <meta charset="UTF-8">를 <head> 바로 다음에 추가
-        if '<head>' in html_normalized:
-            head_pos = html_normalized.find('<head>')
-            if head_pos >= 0:
-                head_end = html_normalized.find('>', head_pos) + 1
-                html_normalized = html_normalized[:head_end] + '\n  <meta charset="UTF-8">' + html_normalized[head_end:]
-                logger.debug("charset 메타 태그 추가 (<head> 다음)")
-        elif '<HEAD>' in html_normalized:
-            head_pos = html_normalized.find('<HEAD>')
-            if head_pos >= 0:
-                head_end = html_normalized.find('>', head_pos) + 1
-                html_normalized = html_normalized[:head_end] + '\n  <meta charset="UTF-8">' + html_normalized[head_end:]
-                logger.debug("charset 메타 태그 추가 (<HEAD> 다음)")
-        else:
-            # head 태그가 없으면 html 태그 다음에 head 추가
-            if '<html>' in html_normalized:
-                html_pos = html_normalized.find('<html>')
-                html_end = html_normalized.find('>', html_pos) + 1
-                html_normalized = html_normalized[:html_end] + '\n<head>\n  <meta charset="UTF-8">\n</head>' + html_normalized[html_end:]
-                logger.debug("head 태그와 charset 메타 태그 추가")
+    font_config = _get_font_config()
+    
+    # charset 메타 태그를 <head> 바로 다음에 한 번만 배치 (WeasyPrint가 UTF-8로 인식하도록)
+    head_tag = '<head>' if '<head>' in html_content else ('<HEAD>' if '<HEAD>' in html_content else None)
+    if head_tag:
+        # 기존 UTF-8 charset 메타 태그를 제거하고 <head> 바로 다음에 재배치
+        html_content = _CHARSET_META_RE.sub('', html_content)
+        head_end = html_content.find(head_tag) + len(head_tag)
+        html_content = html_content[:head_end] + '\n  <meta charset="UTF-8">' + html_content[head_end:]
+        logger.debug(f"charset 메타 태그 배치 ({head_tag} 다음)")
     else:
-        # charset 메타 태그가 있지만 올바른 위치에 있는지 확인
-        # <head> 태그 바로 다음에 오도록 재배치
-        if '<head>' in html_normalized or '<HEAD>' in html_normalized:
-            head_tag = '<head>' if '<head>' in html_normalized else '<HEAD>'
-            head_pos = html_normalized.find(head_tag)
-            if head_pos >= 0:
-                head_end = html_normalized.find('>', head_pos) + 1
-                # charset 메타 태그를 찾아서 제거하고 <head> 바로 다음에 재배치
-                charset_pattern = r'<meta\s+charset=["\']?UTF-8["\']?\s*/?>'
-                html_normalized = re.sub(charset_pattern, '', html_normalized, flags=re.IGNORECASE)
-                html_normalized = html_normalized[:head_end] + '\n  <meta charset="UTF-8">' + html_normalized[head_end:]
-                logger.debug("charset 메타 태그 재배치")
-    
-    # 방법 1: 임시 파일을 UTF-8 바이너리 모드로 저장 (가장 확실)
-    # UTF-8 바이트로 저장하면 WeasyPrint가 charset 메타 태그를 읽어서 올바른 인코딩으로 파싱
-    tmp_file_path = None
+        # head 태그가 없으면 html 태그 다음에 head와 charset 메타 태그 추가
+        if not _CHARSET_DECL_RE.search(html_content):
+            html_tag = _HTML_OPEN_TAG_RE.search(html_content)
+            if html_tag:
+                html_end = html_tag.end()
+                html_content = html_content[:html_end] + '\n<head>\n  <meta charset="UTF-8">\n</head>' + html_content[html_end:]
+                logger.debug("head 태그와 charset 메타 태그 추가")
+    
+    # HTML5 DOCTYPE이 없으면 추가 (WeasyPrint가 HTML5로 인식하도록)
+    if _html_prefix(html_content).startswith('<html'):
+        html_content = '<!DOCTYPE html>\n' + html_content
+        logger.debug("HTML5 DOCTYPE 추가")
+    
+    # 방법 1: UTF-8 바이트를 BytesIO로 전달 (임시 파일 없이 charset 메타 태그로 인코딩 결정)
     try:
-        # HTML을 UTF-8 바이트로 변환
-        html_bytes = html_normalized.encode('utf-8', errors='strict')
-        logger.debug(f"HTML을 UTF-8 바이트로 변환 완료 (크기: {len(html_bytes)} bytes)")
-        
-        # 바이너리 모드로 임시 파일 생성
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.html', delete=False) as tmp_file:
-            tmp_file.write(html_bytes)
-            tmp_file_path = tmp_file.name
-            logger.debug(f"임시 파일 생성: {tmp_file_path}")
-        
-        # 파일 경로로 HTML 로드 (WeasyPrint가 파일의 charset 메타 태그를 읽어서 인코딩 결정)
+        html_file_obj = io.BytesIO(html_content.encode('utf-8'))
         logger.info("WeasyPrint HTML 파싱 시작...")
-        pdf_bytes = HTML(filename=tmp_file_path).write_pdf(font_config=font_config)
-        logger.info("✅ 임시 파일(UTF-8 바이너리)로 PDF 변환 성공")
-    except UnicodeEncodeError as e:
-        logger.warning(f"임시 파일(UTF-8 바이너리) 방법 실패 (인코딩 오류): {str(e)}")
-        # 방법 2: UTF-8 텍스트 모드로 저장
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.html', delete=False) as tmp_file:
-                tmp_file.write(html_normalized)
-                tmp_file_path = tmp_file.name
-                logger.debug(f"임시 파일 생성 (텍스트 모드): {tmp_file_path}")
-            
-            pdf_bytes = HTML(filename=tmp_file_path).write_pdf(font_config=font_config)
-            logger.info("✅ 임시 파일(UTF-8 텍스트)로 PDF 변환 성공")
-        except Exception as e2:
-            logger.warning(f"임시 파일(바이너리) 방법 실패: {str(e2)}")
-            # 방법 3: UTF-8 바이트를 BytesIO로 전달
-            try:
-                html_bytes = html_normalized.encode('utf-8')
-                html_file_obj = io.BytesIO(html_bytes)
-                pdf_bytes = HTML(file_obj=html_file_obj, base_url='.').write_pdf(font_config=font_config)
-                logger.info("✅ BytesIO로 PDF 변환 성공")
-            except Exception as e3:
-                logger.warning(f"BytesIO 방법 실패: {str(e3)}")
-                # 방법 4: 문자열로 직접 전달 (최종 fallback)
-                try:
-                    pdf_bytes = HTML(string=html_normalized).write_pdf(font_config=font_config)
-                    logger.info("✅ 문자열 직접 전달로 PDF 변환 성공")
-                except Exception as e4:
-                    logger.error(f"모든 PDF 변환 방법 실패")
-                    raise RuntimeError(f"PDF 변환 실패 (모든 방법 시도): UTF-8텍스트파일={str(e)}, 바이너리파일={str(e2)}, BytesIO={str(e3)}, 문자열={str(e4)}")
+        pdf_bytes = _write_pdf(HTML(file_obj=html_file_obj, base_url='.'), output_path, font_config=font_config)
+        logger.info("✅ BytesIO로 PDF 변환 성공")
     except Exception as e:
-        logger.warning(f"임시 파일(UTF-8 바이너리) 방법 실패: {str(e)}")
-        logger.debug(f"오류 타입: {type(e).__name__}, 메시지: {str(e)}")
-        # 위와 동일한 fallback 로직
+        logger.warning(f"BytesIO 방법 실패: {str(e)}")
+        # 방법 2: 문자열로 직접 전달 (최종 fallback)
         try:
-            with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', suffix='.html', delete=False) as tmp_file:
-                tmp_file.write(html_normalized)
-                tmp_file_path = tmp_file.name
-                logger.debug(f"임시 파일 생성 (텍스트 모드, fallback): {tmp_file_path}")
-            
-            pdf_bytes = HTML(filename=tmp_file_path).write_pdf(font_config=font_config)
-            logger.info("✅ 임시 파일(UTF-8 텍스트)로 PDF 변환 성공")
+            pdf_bytes = _write_pdf(HTML(string=html_content), output_path, font_config=font_config)
+            logger.info("✅ 문자열 직접 전달로 PDF 변환 성공")
         except Exception as e2:
-            logger.warning(f"임시 파일(바이너리) 방법 실패: {str(e2)}")
-            try:
-                html_bytes = html_normalized.encode('utf-8')
-                html_file_obj = io.BytesIO(html_bytes)
-                pdf_bytes = HTML(file_obj=html_file_obj, base_url='.').write_pdf(font_config=font_config)
-                logger.info("✅ BytesIO로 PDF 변환 성공")
-            except Exception as e3:
-                logger.warning(f"BytesIO 방법 실패: {str(e3)}")
-                try:
-                    pdf_bytes = HTML(string=html_normalized).write_pdf(font_config=font_config)
-                    logger.info("✅ 문자열 직접 전달로 PDF 변환 성공")
-                except Exception as e4:
-                    logger.error(f"모든 PDF 변환 방법 실패")
-                    raise RuntimeError(f"PDF 변환 실패 (모든 방법 시도): UTF-8텍스트파일={str(e)}, 바이너리파일={str(e2)}, BytesIO={str(e3)}, 문자열={str(e4)}")
-    finally:
-        # 임시 파일 삭제
-        if tmp_file_path and os.path.exists(tmp_file_path):
-            try:
-                os.unlink(tmp_file_path)
-            except:
-                pass
-    
-    if output_path:
-        with open(output_path, 'wb') as f:
-            f.write(pdf_bytes)
+            logger.error(f"모든 PDF 변환 방법 실패")
+            raise RuntimeError(f"PDF 변환 실패 (모든 방법 시도): BytesIO={str(e)}, 문자열={str(e2)}")
     
     return pdf_bytes
 
 
+# HtmlToDocx 파서 (스레드별 재사용, 인스턴스는 스레드 안전하지 않음)
+_html_to_docx_local = threading.local()
+
+
+def _get_html_to_docx_parser():
+    """현재 스레드의 HtmlToDocx 파서 반환 (이전 변환에서 남은 HTMLParser 버퍼는 초기화)"""
+    parser = getattr(_html_to_docx_local, "parser", None)
+    if parser is None:
+        parser = _html_to_docx_local.parser = HtmlToDocx()
+    else:
+        # parse_html_string은 문서 관련 상태만 새로 만들고 HTMLParser 버퍼는 그대로 두므로 초기화
+        parser.reset()
+    return parser
+
+
 def html_to_docx(html_content: str, output_path: Optional[str] = None) -> bytes:
     """
     HTML을 DOCX로 변환 (HtmlToDocx 사용, 인코딩 문제 해결)
@@ -775,9 +837,10 @@ def html_to_docx(html_content: str, output_path: Optional[str] = None) -> bytes:
         ImportError: HtmlToDocx가 설치되지 않음
         RuntimeError: 변환 실패
     """
-    logger.info(f"html_to_docx 함수 호출됨 (HtmlToDocx={HtmlToDocx is not None})")
+    htmldocx_available = _load_htmldocx()
+    logger.info(f"html_to_docx 함수 호출됨 (HtmlToDocx={htmldocx_available})")
     
-    if HtmlToDocx is None:
+    if not htmldocx_available:
         # HtmlToDocx가 없으면 LibreOffice fallback
         logger.warning("HtmlToDocx가 설치되지 않음, LibreOffice 사용")
         return html_to_docx_with_libreoffice(html_content, output_path)
@@ -785,41 +848,23 @@ def html_to_docx(html_content: str, output_path: Optional[str] = None) -> bytes:
     try:
         logger.info("HtmlToDocx로 HTML → DOCX 변환 시도...")
         # HtmlToDocx로 HTML을 DOCX로 변환
-        parser = HtmlToDocx()
+        parser = _get_html_to_docx_parser()
         
         # HTML 문자열을 DOCX Document로 변환
         logger.debug(f"HTML 내용 길이: {len(html_content)}")
         doc = parser.parse_html_string(html_content)
         logger.debug("HtmlToDocx.parse_html_string() 성공")
         
-        # 임시 파일을 사용하여 DOCX 저장 (Document.save()는 파일 경로만 받음)
-        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
+        # 메모리 버퍼에 저장 (임시 파일 왕복 없음, output_path가 있으면 같은 바이트를 파일에도 저장)
+        doc_bytes = io.BytesIO()
+        doc.save(doc_bytes)
+        docx_content = doc_bytes.getvalue()
+        if output_path:
+            Path(output_path).write_bytes(docx_content)
+        logger.debug(f"DOCX 파일 크기: {len(docx_content)} bytes")
         
-        try:
-            # 임시 파일에 저장
-            doc.save(tmp_path)
-            logger.debug(f"DOCX 임시 파일 저장: {tmp_path}")
-            
-            # 파일 읽기
-            with open(tmp_path, 'rb') as f:
-                docx_content = f.read()
-            logger.debug(f"DOCX 파일 크기: {len(docx_content)} bytes")
-            
-            # 출력 경로가 있으면 복사
-            if output_path:
-                with open(output_path, 'wb') as f:
-                    f.write(docx_content)
-            
-            logger.info("✅ HTML → DOCX 변환 성공 (HtmlToDocx)")
-            return docx_content
-        finally:
-            # 임시 파일 삭제
-            if os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except:
-                    pass
+        logger.info("✅ HTML → DOCX 변환 성공 (HtmlToDocx)")
+        return docx_content
         
     except Exception as e:
         logger.error(f"HtmlToDocx 변환 실패: {str(e)}")
@@ -830,6 +875,101 @@ def html_to_docx(html_content: str, output_path: Optional[str] = None) -> bytes:
         return html_to_docx_with_libreoffice(html_content, output_path)
 
 
+# LibreOffice 변환용 임시 디렉토리 위치 (/dev/shm이 있으면 tmpfs에서 입출력, 없으면 기본 임시 디렉토리)
+_SOFFICE_TEMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# 스레드별 soffice 사용자 프로필 (병렬 변환 시 기본 프로필 잠금 충돌 방지, 스레드 안에서는 재사용)
+_soffice_profile = threading.local()
+
+
+def _get_thread_profile_url() -> str:
+    """
+    현재 스레드 전용 LibreOffice 사용자 프로필 URL 반환 (최초 호출 시 생성)
+    
+    프로필은 tmpfs가 아닌 기본 임시 디렉토리에 만들고, 같은 스레드의 이후 변환에서 재사용
+    (soffice 최초 실행 시의 프로필 초기화를 변환마다 반복하지 않음)
+    """
+    profile_url = getattr(_soffice_profile, "url", None)
+    if profile_url is None:
+        profile_dir = tempfile.mkdtemp(prefix="soffice_profile_")
+        atexit.register(shutil.rmtree, profile_dir, True)
+        profile_url = _soffice_profile.url = Path(profile_dir).as_uri()
+    return profile_url
+
+
+def _run_soffice_convert(
+    soffice_path: str,
+    input_path: str,
+    convert_to: str,
+    outdir: str,
+    timeout: int = 60
+) -> subprocess.CompletedProcess:
+    """
+    LibreOffice 변환 실행 (soffice --headless, 스레드별 사용자 프로필 사용)
+    
+    Raises:
+        subprocess.TimeoutExpired: soffice 실행 시간 초과
+    """
+    return subprocess.run(
+        [
+            soffice_path,
+            f"-env:UserInstallation={_get_thread_profile_url()}",
+            "--headless",
+            "--convert-to", convert_to,
+            "--outdir", outdir,
+            input_path
+        ],
+        capture_output=True,
+        timeout=timeout
+    )
+
+
+def _soffice_output(result: subprocess.CompletedProcess) -> str:
+    """soffice 실패 메시지용 출력 디코딩 (stderr 우선, 실패 시에만 호출)"""
+    return (result.stderr or result.stdout or b"").decode("utf-8", errors="replace")
+
+
+# LibreOffice 변환용 HTML 문서 머리/꼬리 (파란색 스타일 포함, 미리 인코딩해 두고 본문만 인코딩)
+_LIBREOFFICE_HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body {
+            font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
+            font-size: 11pt;
+            line-height: 1.6;
+        }
+        .modified, .extracted {
+            color: #0066CC;
+        }
+    </style>
+</head>
+<body>
+""".encode("utf-8")
+
+_LIBREOFFICE_HTML_TAIL = """
+</body>
+</html>
+""".encode("utf-8")
+
+
+def _write_html_for_libreoffice(html_path: str, html_content: str) -> None:
+    """
+    LibreOffice 입력 HTML 파일 저장
+    
+    HTML body만 있으면 미리 인코딩한 머리/꼬리 사이에 본문을 기록
+    (템플릿 문자열 포맷팅 없이 파일에 바로 이어 씀)
+    """
+    with open(html_path, "wb") as f:
+        if not _is_full_html_document(html_content):
+            f.write(_LIBREOFFICE_HTML_HEAD)
+            f.write(html_content.encode("utf-8"))
+            f.write(_LIBREOFFICE_HTML_TAIL)
+        else:
+            f.write(html_content.encode("utf-8"))
+
+
 def html_to_docx_with_libreoffice(html_content: str, output_path: Optional[str] = None) -> bytes:
     """
     HTML을 DOCX로 변환 (LibreOffice 사용, 파란색 스타일 유지)
@@ -852,55 +992,19 @@ def html_to_docx_with_libreoffice(html_content: str, output_path: Optional[str]
             "Docker 환경에서는 Dockerfile에 LibreOffice 설치가 필요합니다."
         )
     
-    # HTML이 완전한 문서인지 확인
-    if not html_content.strip().startswith("<!DOCTYPE html>") and not html_content.strip().startswith("<html>"):
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.6;
-                }}
-                .modified, .extracted {{
-                    color: #0066CC;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
-    
     # 임시 디렉토리 생성
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=_SOFFICE_TEMP_ROOT) as temp_dir:
         # HTML 파일 저장
         html_path = os.path.join(temp_dir, "input.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        _write_html_for_libreoffice(html_path, html_content)
         
         # LibreOffice로 DOCX 변환
         try:
-            result = subprocess.run(
-                [
-                    soffice_path,
-                    "--headless",
-                    "--convert-to", "docx",
-                    "--outdir", temp_dir,
-                    html_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = _run_soffice_convert(soffice_path, html_path, "docx", temp_dir)
             
             if result.returncode != 0:
                 raise RuntimeError(
-                    f"HTML → DOCX 변환 실패 (exit code {result.returncode}): {result.stderr or result.stdout}"
+                    f"HTML → DOCX 변환 실패 (exit code {result.returncode}): {_soffice_output(result)}"
                 )
             
             # 변환된 DOCX 파일 읽기
@@ -910,14 +1014,12 @@ def html_to_docx_with_libreoffice(html_content: str, output_path: Optional[str]
                     f"DOCX 파일이 생성되지 않았습니다. 생성된 파일: {os.listdir(temp_dir)}"
                 )
             
-            with open(docx_path, "rb") as f:
-                docx_content = f.read()
+            docx_content = Path(docx_path).read_bytes()
             
             if output_path:
-                with open(output_path, 'wb') as f:
-                    f.write(docx_content)
+                Path(output_path).write_bytes(docx_content)
             
-            print(f"✅ HTML → DOCX 변환 성공 (LibreOffice)")
+            logger.info("✅ HTML → DOCX 변환 성공 (LibreOffice)")
             return docx_content
             
         except subprocess.TimeoutExpired:
@@ -949,30 +1051,18 @@ def docx_to_pdf(docx_content: bytes, output_path: Optional[str] = None) -> bytes
         )
     
     # 임시 디렉토리 생성
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=_SOFFICE_TEMP_ROOT) as temp_dir:
         # DOCX 파일 저장
         docx_path = os.path.join(temp_dir, "input.docx")
-        with open(docx_path, "wb") as f:
-            f.write(docx_content)
+        Path(docx_path).write_bytes(docx_content)
         
         # LibreOffice로 PDF 변환
         try:
-            result = subprocess.run(
-                [
-                    soffice_path,
-                    "--headless",
-                    "--convert-to", "pdf",
-                    "--outdir", temp_dir,
-                    docx_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = _run_soffice_convert(soffice_path, docx_path, "pdf", temp_dir)
             
             if result.returncode != 0:
                 raise RuntimeError(
-                    f"DOCX → PDF 변환 실패 (exit code {result.returncode}): {result.stderr or result.stdout}"
+                    f"DOCX → PDF 변환 실패 (exit code {result.returncode}): {_soffice_output(result)}"
                 )
             
             # 변환된 PDF 파일 읽기
@@ -982,12 +1072,10 @@ def docx_to_pdf(docx_content: bytes, output_path: Optional[str] = None) -> bytes
                     f"PDF 파일이 생성되지 않았습니다. 생성된 파일: {os.listdir(temp_dir)}"
                 )
             
-            with open(pdf_path, "rb") as f:
-                pdf_content = f.read()
+            pdf_content = Path(pdf_path).read_bytes()
             
             if output_path:
-                with open(output_path, 'wb') as f:
-                    f.write(pdf_content)
+                Path(output_path).write_bytes(pdf_content)
             
             logger.info("✅ DOCX → PDF 변환 성공 (LibreOffice)")
             return pdf_content
@@ -1023,66 +1111,28 @@ def html_to_hwp_with_libreoffice(html_content: str, output_path: Optional[str] =
             "Docker 환경에서는 Dockerfile에 LibreOffice 설치가 필요합니다."
         )
     
-    # HTML이 완전한 문서인지 확인
-    if not html_content.strip().startswith("<!DOCTYPE html>") and not html_content.strip().startswith("<html>"):
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: "맑은 고딕", "Malgun Gothic", sans-serif;
-                    font-size: 11pt;
-                    line-height: 1.6;
-                }}
-                .modified, .extracted {{
-                    color: #0066CC;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_content}
-        </body>
-        </html>
-        """
-    
     # 임시 디렉토리 생성
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=_SOFFICE_TEMP_ROOT) as temp_dir:
         # HTML 파일 저장
         html_path = os.path.join(temp_dir, "input.html")
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        _write_html_for_libreoffice(html_path, html_content)
         
         # 방법 1: HTML → HWP 직접 변환 시도
         hwp_path = os.path.join(temp_dir, "input.hwp")
         try:
             logger.info("HTML → HWP 직접 변환 시도...")
-            result = subprocess.run(
-                [
-                    soffice_path,
-                    "--headless",
-                    "--convert-to", "hwp",
-                    "--outdir", temp_dir,
-                    html_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = _run_soffice_convert(soffice_path, html_path, "hwp", temp_dir)
             
             if result.returncode == 0 and os.path.exists(hwp_path):
-                with open(hwp_path, "rb") as f:
-                    hwp_content = f.read()
+                hwp_content = Path(hwp_path).read_bytes()
                 
                 if output_path:
-                    with open(output_path, 'wb') as f:
-                        f.write(hwp_content)
+                    Path(output_path).write_bytes(hwp_content)
                 
                 logger.info("✅ HTML → HWP 직접 변환 성공")
                 return hwp_content
             else:
-                logger.warning(f"HTML → HWP 직접 변환 실패: {result.stderr or result.stdout}")
+                logger.warning(f"HTML → HWP 직접 변환 실패: {_soffice_output(result)}")
         except Exception as e:
             logger.warning(f"HTML → HWP 직접 변환 시도 실패: {str(e)}")
         
@@ -1093,36 +1143,23 @@ def html_to_hwp_with_libreoffice(html_content: str, output_path: Optional[str] =
             logger.info("LibreOffice는 HWP 변환을 지원하지 않습니다. HTML → DOCX로 변환합니다...")
             # HTML → DOCX
             docx_path = os.path.join(temp_dir, "input.docx")
-            result1 = subprocess.run(
-                [
-                    soffice_path,
-                    "--headless",
-                    "--convert-to", "docx",
-                    "--outdir", temp_dir,
-                    html_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result1 = _run_soffice_convert(soffice_path, html_path, "docx", temp_dir)
             
             if result1.returncode != 0 or not os.path.exists(docx_path):
                 raise RuntimeError(
-                    f"HTML → DOCX 변환 실패 (exit code {result1.returncode}): {result1.stderr or result1.stdout}"
+                    f"HTML → DOCX 변환 실패 (exit code {result1.returncode}): {_soffice_output(result1)}"
                 )
             
             logger.info("✅ HTML → DOCX 변환 성공 (HWP는 LibreOffice에서 지원하지 않으므로 DOCX 반환)")
             
             # DOCX 파일 반환 (HWP 대신)
-            with open(docx_path, "rb") as f:
-                docx_content = f.read()
+            docx_content = Path(docx_path).read_bytes()
             
             if output_path:
                 # 출력 경로가 있으면 .hwp 확장자를 .docx로 변경
                 if output_path.endswith('.hwp'):
                     output_path = output_path[:-4] + '.docx'
-                with open(output_path, 'wb') as f:
-                    f.write(docx_content)
+                Path(output_path).write_bytes(docx_content)
             
             logger.warning("⚠️ HWP 변환은 LibreOffice에서 지원하지 않습니다. DOCX 파일을 반환합니다.")
             logger.warning("   한글(HWP)에서 DOCX 파일을 열어서 HWP로 저장할 수 있습니다.")
@@ -1152,39 +1189,36 @@ def mark_modified_text_in_html(html_content: str, modified_texts: list, extracte
     if extracted_texts is None:
         extracted_texts = []
     
-    result = html_content
-    
-    # 수정된 텍스트를 파란색으로 마킹
-    for text in modified_texts:
-        if text and text.strip():
-            # HTML 특수문자 이스케이프
-            escaped_text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            # 파란색 span으로 감싸기
-            marked_text = f'<span class="modified" style="color: #0066CC;">{escaped_text}</span>'
-            # 텍스트를 찾아서 교체 (대소문자 구분 없이)
-            result = re.sub(
-                re.escape(text),
-                marked_text,
-                result,
-                flags=re.IGNORECASE
-            )
+    # 마킹할 텍스트(HTML에 나타나는 이스케이프된 형태) → 파란색 span (같은 텍스트는 수정된 텍스트 쪽이 우선)
+    marked_map = {}
+    for css_class, texts in (("modified", modified_texts), ("extracted", extracted_texts)):
+        # 중복 텍스트는 한 번만 이스케이프
+        for text in dict.fromkeys(texts):
+            if text and text.strip():
+                # HTML 특수문자 이스케이프 (&, <, > - 텍스트 노드 기준이므로 따옴표는 그대로)
+                escaped_text = html.escape(text, quote=False)
+                key = escaped_text.lower()
+                if key not in marked_map:
+                    marked_map[key] = f'<span class="{css_class}" style="color: #0066CC;">{escaped_text}</span>'
     
-    # 자동 추출된 텍스트를 파란색으로 마킹
-    for text in extracted_texts:
-        if text and text.strip():
-            # HTML 특수문자 이스케이프
-            escaped_text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            # 파란색 span으로 감싸기
-            marked_text = f'<span class="extracted" style="color: #0066CC;">{escaped_text}</span>'
-            # 텍스트를 찾아서 교체 (대소문자 구분 없이)
-            result = re.sub(
-                re.escape(text),
-                marked_text,
-                result,
-                flags=re.IGNORECASE
-            )
+    if not marked_map:
+        return html_content
+    
+    # 태그·주석·script/style 블록은 그대로 두고 텍스트 부분만 한 번 순회하며 교체
+    # (속성값 안의 텍스트가 span으로 바뀌어 HTML이 깨지지 않도록, 대소문자 구분 없이, 긴 텍스트 우선)
+    pattern = re.compile(
+        f'({_HTML_MARKUP_PATTERN})|('
+        + '|'.join(re.escape(text) for text in sorted(marked_map, key=len, reverse=True))
+        + ')',
+        re.IGNORECASE | re.DOTALL
+    )
+    
+    def mark(match: re.Match) -> str:
+        if match.group(1) is not None:
+            return match.group(1)
+        return marked_map.get(match.group(2).lower(), match.group(2))
     
-    return result
+    return pattern.sub(mark, html_content)
 
 
 def convert_html_document(
@@ -1223,6 +1257,18 @@ def convert_html_document(
         raise ValueError(f"지원하지 않는 형식: {output_format}. 'pdf', 'docx', 또는 'hwp'를 사용하세요.")
 
 
+async def convert_html_document_async(
+    html_content: str,
+    output_format: str = "pdf",
+    output_path: Optional[str] = None
+) -> bytes:
+    """convert_html_document의 비동기 버전 (변환 전용 스레드 풀에서 변환, 이벤트 루프 차단 없음)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_convert_executor(), convert_html_document, html_content, output_format, output_path
+    )
+
+
 def hwp_to_pdf(hwp_content: bytes) -> bytes:
     """
     HWP 파일을 PDF로 변환 (LibreOffice 사용)
@@ -1246,40 +1292,30 @@ def hwp_to_pdf(hwp_content: bytes) -> bytes:
         )
 
     # 임시 디렉토리 생성
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory(dir=_SOFFICE_TEMP_ROOT) as temp_dir:
         # HWP 파일 저장
         hwp_path = os.path.join(temp_dir, "input.hwp")
-        with open(hwp_path, "wb") as f:
-            f.write(hwp_content)
+        Path(hwp_path).write_bytes(hwp_content)
 
         # LibreOffice로 PDF 변환
         try:
-            result = subprocess.run(
-                [
-                    soffice_path,
-                    "--headless",
-                    "--convert-to", "pdf",
-                    "--outdir", temp_dir,
-                    hwp_path
-                ],
-                capture_output=True,
-                text=True,
-                timeout=60  # 60초 타임아웃
-            )
-
-            # 디버깅: 출력 확인
-            print(f"🔍 LibreOffice 실행 결과:")
-            print(f"  Return code: {result.returncode}")
-            print(f"  STDOUT: {result.stdout}")
-            print(f"  STDERR: {result.stderr}")
+            result = _run_soffice_convert(soffice_path, hwp_path, "pdf", temp_dir)
 
             # 생성된 파일 목록 확인
             generated_files = os.listdir(temp_dir)
-            print(f"  생성된 파일들: {generated_files}")
+
+            # 디버깅: 출력 확인 (DEBUG 레벨에서만 출력을 디코딩)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"LibreOffice 실행 결과: return code {result.returncode}, "
+                    f"STDOUT: {result.stdout.decode('utf-8', errors='replace')}, "
+                    f"STDERR: {result.stderr.decode('utf-8', errors='replace')}, "
+                    f"생성된 파일들: {generated_files}"
+                )
 
             if result.returncode != 0:
                 raise RuntimeError(
-                    f"HWP → PDF 변환 실패 (exit code {result.returncode}): {result.stderr or result.stdout}"
+                    f"HWP → PDF 변환 실패 (exit code {result.returncode}): {_soffice_output(result)}"
                 )
 
             # 변환된 PDF 파일 읽기
@@ -1289,8 +1325,7 @@ def hwp_to_pdf(hwp_content: bytes) -> bytes:
                     f"PDF 파일이 생성되지 않았습니다. 생성된 파일: {generated_files}"
                 )
 
-            with open(pdf_path, "rb") as f:
-                pdf_content = f.read()
+            pdf_content = Path(pdf_path).read_bytes()
 
             return pdf_content
 